@@ -0,0 +1,53 @@
+"""conversations inbox summary table
+
+Revision ID: 2d7cd0641477
+Revises: ab606cfd7b1a
+Create Date: 2026-10-18 16:19:30.503573
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7cd0641477'
+down_revision = 'ab606cfd7b1a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('conversations',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('partner_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_message', sa.Text(), nullable=True),
+    sa.Column('last_sender_id', sa.Integer(), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('unread_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ),
+    sa.ForeignKeyConstraint(['partner_id'], ['userdetails.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['userdetails.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'partner_id', name='unique_conversation_user_partner')
+    )
+    op.create_index('ix_conversations_user_last_message_at', 'conversations', ['user_id', 'last_message_at', 'id'],
+                    unique=False)
+
+    # One row per participant of every existing chat, with its latest message. There was no read
+    # state before, so history starts out read. messages.timestamp holds naive UTC times.
+    op.execute("""
+        INSERT INTO conversations (user_id, partner_id, last_message_id, last_message, last_sender_id,
+                                   last_message_at, unread_count)
+        SELECT DISTINCT ON (p.user_id, p.partner_id)
+               p.user_id, p.partner_id, m.id, m.message, m.sender_id, m.timestamp AT TIME ZONE 'UTC', 0
+        FROM messages m
+        CROSS JOIN LATERAL (VALUES (m.sender_id, m.receiver_id), (m.receiver_id, m.sender_id)) AS p(user_id, partner_id)
+        ORDER BY p.user_id, p.partner_id, m.id DESC
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_conversations_user_last_message_at', table_name='conversations')
+    op.drop_table('conversations')
@@ -0,0 +1,43 @@
+"""attendee counter for other genders
+
+Revision ID: 3b677f67e78d
+Revises: 2d7cd0641477
+Create Date: 2026-10-18 17:02:43.278496
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b677f67e78d'
+down_revision = '2d7cd0641477'
+branch_labels = None
+depends_on = None
+
+# Attendees whose gender /attend didn't count until now
+OTHER_ATTENDEES = (
+    'SELECT count(*) FROM attendance JOIN userdata ON userdata.user_auth_id = attendance.user_id '
+    'WHERE attendance.location_id = "locationInfo".id '
+    "AND lower(userdata.gender) NOT IN ('men', 'man', 'male', 'women', 'woman', 'female')"
+)
+
+
+def upgrade():
+    op.add_column('locationInfo', sa.Column('otherAttendees', sa.Integer(), nullable=True))
+    op.add_column('attendance_counter_shards',
+                  sa.Column('otherAttendees', sa.Integer(), nullable=False, server_default='0'))
+    op.alter_column('attendance_counter_shards', 'otherAttendees', server_default=None)
+
+    op.execute(f'UPDATE "locationInfo" SET "otherAttendees" = ({OTHER_ATTENDEES})')
+    # Sharded events read their counts from the shards: put the existing attendees on shard 0
+    op.execute(
+        'UPDATE attendance_counter_shards SET "otherAttendees" = "locationInfo"."otherAttendees" '
+        'FROM "locationInfo" WHERE "locationInfo".id = attendance_counter_shards.location_id '
+        'AND attendance_counter_shards.shard = 0'
+    )
+
+
+def downgrade():
+    op.drop_column('attendance_counter_shards', 'otherAttendees')
+    op.drop_column('locationInfo', 'otherAttendees')
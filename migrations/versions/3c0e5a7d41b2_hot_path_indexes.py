@@ -0,0 +1,54 @@
+"""indexes for the hot query paths, one userdata row per user
+
+Revision ID: 3c0e5a7d41b2
+Revises: 9d72aff52ed6
+Create Date: 2026-10-18 16:05:47.902114
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3c0e5a7d41b2'
+down_revision = '9d72aff52ed6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Matchmaking: round lookups per location, and every match of a user
+    op.create_index('ix_matches_location_round_status', 'matches',
+                    ['location_id', 'round_number', 'status', 'matched_expired'], unique=False)
+    op.create_index(op.f('ix_matches_user1_id'), 'matches', ['user1_id'], unique=False)
+    op.create_index(op.f('ix_matches_user2_id'), 'matches', ['user2_id'], unique=False)
+
+    # Chat history between two users, ordered by time
+    op.create_index('ix_messages_sender_receiver_timestamp', 'messages',
+                    ['sender_id', 'receiver_id', 'timestamp'], unique=False)
+
+    # Attendees / checked-in users of a location (the unique constraints lead with user_id)
+    op.create_index(op.f('ix_attendance_location_id'), 'attendance', ['location_id'], unique=False)
+    op.create_index(op.f('ix_checkins_location_id'), 'checkins', ['location_id'], unique=False)
+
+    # Profile lookups by user
+    op.create_index(op.f('ix_relationshipData_user_auth_id'), 'relationshipData', ['user_auth_id'], unique=False)
+    op.create_index(op.f('ix_userImage_user_auth_id'), 'userImage', ['user_auth_id'], unique=False)
+
+    # userdata is one row per user (UserData.user backref is uselist=False); keep the oldest duplicate
+    op.execute(
+        'DELETE FROM userdata a USING userdata b '
+        'WHERE a.user_auth_id = b.user_auth_id AND a.id > b.id'
+    )
+    op.create_unique_constraint('unique_userdata_user_auth_id', 'userdata', ['user_auth_id'])
+
+
+def downgrade():
+    op.drop_constraint('unique_userdata_user_auth_id', 'userdata', type_='unique')
+    op.drop_index(op.f('ix_userImage_user_auth_id'), table_name='userImage')
+    op.drop_index(op.f('ix_relationshipData_user_auth_id'), table_name='relationshipData')
+    op.drop_index(op.f('ix_checkins_location_id'), table_name='checkins')
+    op.drop_index(op.f('ix_attendance_location_id'), table_name='attendance')
+    op.drop_index('ix_messages_sender_receiver_timestamp', table_name='messages')
+    op.drop_index(op.f('ix_matches_user2_id'), table_name='matches')
+    op.drop_index(op.f('ix_matches_user1_id'), table_name='matches')
+    op.drop_index('ix_matches_location_round_status', table_name='matches')
@@ -0,0 +1,27 @@
+"""matching mode per location
+
+Revision ID: 617bb779e7a3
+Revises: bd1177f989eb
+Create Date: 2026-10-18 15:36:32.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '617bb779e7a3'
+down_revision = 'bd1177f989eb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created with db.create_all() may already have the column
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('locationInfo')}
+    if 'matching_mode' not in columns:
+        op.add_column('locationInfo', sa.Column('matching_mode', sa.String(length=20), nullable=True))
+
+
+def downgrade():
+    op.drop_column('locationInfo', 'matching_mode')
@@ -0,0 +1,43 @@
+"""durable matchmaking job queue
+
+Revision ID: 637471bf6d52
+Revises: cd27cfff9656
+Create Date: 2026-10-18 16:05:44.426113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '637471bf6d52'
+down_revision = 'cd27cfff9656'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('matchmaking_jobs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['location_id'], ['locationInfo.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_matchmaking_jobs_location_id', 'matchmaking_jobs', ['location_id'], unique=False)
+    # One queued job per location (enqueue_matchmaking relies on it for ON CONFLICT DO NOTHING)
+    op.create_index('uq_matchmaking_jobs_queued_location', 'matchmaking_jobs', ['location_id'], unique=True,
+                    postgresql_where=sa.text("status = 'queued'"))
+
+
+def downgrade():
+    op.drop_index('uq_matchmaking_jobs_queued_location', table_name='matchmaking_jobs')
+    op.drop_index('ix_matchmaking_jobs_location_id', table_name='matchmaking_jobs')
+    op.drop_table('matchmaking_jobs')
@@ -0,0 +1,36 @@
+"""sharded attendee counters for busy events
+
+Revision ID: 662d748aa026
+Revises: 3c0e5a7d41b2
+Create Date: 2026-10-18 15:58:30.498638
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '662d748aa026'
+down_revision = '3c0e5a7d41b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('locationInfo', sa.Column('attendance_shards', sa.Integer(), nullable=True))
+    op.create_table('attendance_counter_shards',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('capacity', sa.Integer(), nullable=True),
+    sa.Column('maleAttendees', sa.Integer(), nullable=False),
+    sa.Column('femaleAttendees', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['locationInfo.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('location_id', 'shard', name='unique_location_attendance_shard')
+    )
+
+
+def downgrade():
+    op.drop_table('attendance_counter_shards')
+    op.drop_column('locationInfo', 'attendance_shards')
@@ -0,0 +1,33 @@
+"""one preference row per (user, preferred user)
+
+Revision ID: 9d72aff52ed6
+Revises: c02eed3b539b
+Create Date: 2026-10-18 15:52:04.118326
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d72aff52ed6'
+down_revision = 'c02eed3b539b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created with db.create_all() may already have the constraint
+    inspector = sa.inspect(op.get_bind())
+    constraints = {constraint['name'] for constraint in inspector.get_unique_constraints('user_preference')}
+    if 'unique_user_preference' not in constraints:
+        # Keep the oldest row of each (user, preferred user) pair, it is the one the app has been reading and updating
+        op.execute(
+            'DELETE FROM user_preference a USING user_preference b '
+            'WHERE a.user_id = b.user_id AND a.preferred_user_id = b.preferred_user_id AND a.id > b.id'
+        )
+        op.create_unique_constraint('unique_user_preference', 'user_preference', ['user_id', 'preferred_user_id'])
+
+
+def downgrade():
+    op.drop_constraint('unique_user_preference', 'user_preference', type_='unique')
@@ -0,0 +1,36 @@
+"""conversation key on messages for paginated chat history
+
+Revision ID: ab606cfd7b1a
+Revises: e224173247c4
+Create Date: 2026-10-18 16:17:00.927153
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ab606cfd7b1a'
+down_revision = 'e224173247c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('messages', sa.Column('conversation_key', sa.String(length=50), nullable=True))
+    # Same format as app.conversation_key: 'lower user id:higher user id'
+    op.execute(
+        "UPDATE messages SET conversation_key = "
+        "least(sender_id, receiver_id)::text || ':' || greatest(sender_id, receiver_id)::text"
+    )
+    op.alter_column('messages', 'conversation_key', existing_type=sa.String(length=50), nullable=False)
+    op.create_index('ix_messages_conversation_key_id', 'messages', ['conversation_key', 'id'], unique=False)
+    # get_chats was the only user of the sender/receiver index
+    op.drop_index('ix_messages_sender_receiver_timestamp', table_name='messages')
+
+
+def downgrade():
+    op.create_index('ix_messages_sender_receiver_timestamp', 'messages', ['sender_id', 'receiver_id', 'timestamp'],
+                    unique=False)
+    op.drop_index('ix_messages_conversation_key_id', table_name='messages')
+    op.drop_column('messages', 'conversation_key')
@@ -0,0 +1,35 @@
+"""per-round pending decision counters
+
+Revision ID: c02eed3b539b
+Revises: 617bb779e7a3
+Create Date: 2026-10-18 15:38:51.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c02eed3b539b'
+down_revision = '617bb779e7a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created with db.create_all() may already have the table
+    if not sa.inspect(op.get_bind()).has_table('round_progress'):
+        op.create_table('round_progress',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=False),
+        sa.Column('round_number', sa.Integer(), nullable=False),
+        sa.Column('total_matches', sa.Integer(), nullable=True),
+        sa.Column('pending_decisions', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['location_id'], ['locationInfo.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('location_id', 'round_number', name='unique_location_round_progress')
+        )
+
+
+def downgrade():
+    op.drop_table('round_progress')
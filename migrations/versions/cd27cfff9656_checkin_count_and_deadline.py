@@ -0,0 +1,48 @@
+"""check-in counter and deadline on locationInfo
+
+Revision ID: cd27cfff9656
+Revises: 662d748aa026
+Create Date: 2026-10-18 16:00:28.974390
+
+"""
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cd27cfff9656'
+down_revision = '662d748aa026'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('locationInfo', sa.Column('checkin_count', sa.Integer(), nullable=True))
+    op.add_column('locationInfo', sa.Column('checkin_closes_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.execute(
+        'UPDATE "locationInfo" SET checkin_count = '
+        '(SELECT count(*) FROM checkins WHERE checkins.location_id = "locationInfo".id)'
+    )
+
+    # Same parsing as app.event_start (server local time, made aware) + 10 minutes, NULL if they don't parse
+    bind = op.get_bind()
+    location_info = sa.table('locationInfo', sa.column('id'), sa.column('date'), sa.column('time'),
+                             sa.column('checkin_closes_at'))
+    for location_id, date, time in bind.execute(sa.select(location_info.c.id, location_info.c.date,
+                                                          location_info.c.time)).all():
+        try:
+            event_time = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M").astimezone()
+        except (ValueError, TypeError):
+            continue
+        bind.execute(
+            location_info.update().where(location_info.c.id == location_id)
+            .values(checkin_closes_at=event_time + timedelta(minutes=10))
+        )
+
+
+def downgrade():
+    op.drop_column('locationInfo', 'checkin_closes_at')
+    op.drop_column('locationInfo', 'checkin_count')
@@ -0,0 +1,28 @@
+"""indexed event start time on locationInfo
+
+Revision ID: e224173247c4
+Revises: 637471bf6d52
+Create Date: 2026-10-18 16:14:56.540698
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e224173247c4'
+down_revision = '637471bf6d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('locationInfo', sa.Column('starts_at', sa.DateTime(timezone=True), nullable=True))
+    # checkin_closes_at was parsed from the same date/time strings, 10 minutes later
+    op.execute('UPDATE "locationInfo" SET starts_at = checkin_closes_at - interval \'10 minutes\'')
+    op.create_index('ix_locationInfo_starts_at', 'locationInfo', ['starts_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_locationInfo_starts_at', table_name='locationInfo')
+    op.drop_column('locationInfo', 'starts_at')
@@ -0,0 +1,24 @@
+"""retry backoff for matchmaking jobs
+
+Revision ID: f75d27f88195
+Revises: 3b677f67e78d
+Create Date: 2026-10-18 17:05:50.330691
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f75d27f88195'
+down_revision = '3b677f67e78d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('matchmaking_jobs', sa.Column('run_after', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('matchmaking_jobs', 'run_after')
@@ -0,0 +1,78 @@
+"""
+Load test of POST /checkin: many concurrent scans at the door of one event.
+
+    TEST_DATABASE_URL=postgresql://... python tests/bench_checkin.py [users] [slots] [threads]
+
+Wipes and migrates the database like the tests do. Every ticket is scanned twice. Reports how
+many scans were admitted (must equal the slots), how many closed check-in (must be 1), the scan
+rate, and the time per scan without contention.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['DATABASE_URL'] = os.environ['TEST_DATABASE_URL']
+os.environ.setdefault('MATCHMAKING_WORKERS', '0')
+os.environ.setdefault('CHECKIN_SCHEDULER', 'false')
+
+from flask_migrate import upgrade  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+import app as wings  # noqa: E402
+
+
+def reset():
+    with wings.db.engine.begin() as conn:
+        conn.exec_driver_sql('DROP SCHEMA public CASCADE')
+        conn.exec_driver_sql('CREATE SCHEMA public')
+    upgrade(directory=os.path.join(ROOT, 'migrations'))
+
+
+def create_event(n_users, slots, first_id):
+    ids = list(range(first_id, first_id + n_users))
+    wings.db.session.execute(insert(wings.Task), [
+        {'id': i, 'email': f'user{i}@example.com', 'password': 'secret'} for i in ids
+    ])
+    location = wings.LocationInfo(location='bar', maxAttendees=slots, current_round=1)
+    wings.db.session.add(location)
+    wings.db.session.flush()
+    wings.db.session.execute(insert(wings.Attendance), [
+        {'user_id': i, 'location_id': location.id, 'hasAttended': True} for i in ids
+    ])
+    wings.db.session.commit()
+    return location.id, ids
+
+
+def scan(user_id, location_id):
+    response = wings.app.test_client().post('/checkin', json={'user_id': user_id, 'location_id': location_id})
+    return response.status_code, response.get_json()
+
+
+def main(n_users, slots, threads):
+    with wings.app.app_context():
+        reset()
+        location_id, ids = create_event(n_users, slots, 1)
+        sequential_id, sequential_ids = create_event(n_users, n_users, n_users + 1)
+        wings.db.session.remove()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(scan, ids * 2, [location_id] * (2 * n_users)))
+    elapsed = time.perf_counter() - start
+    admitted = [body for status, body in results if status == 200]
+    closed = [body for body in admitted if body['checkin_closed']]
+    print(f'{2 * n_users} concurrent scans, {slots} slots, {threads} threads: {len(admitted)} admitted, '
+          f'{len(closed)} closed check-in, {2 * n_users / elapsed:.0f} scans/s')
+
+    start = time.perf_counter()
+    for user_id in sequential_ids:
+        scan(user_id, sequential_id)
+    print(f'sequential: {(time.perf_counter() - start) / n_users * 1000:.1f} ms per scan')
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [300, 250, 32][len(args):]))
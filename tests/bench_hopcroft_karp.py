@@ -0,0 +1,60 @@
+"""
+Benchmark: hopcroft_karp vs the recursive dict-based version it replaced.
+No database needed.
+
+    python tests/bench_hopcroft_karp.py [degree]
+
+Each male gets `degree` random allowed females; sizes go up to 20k x 20k users.
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import app as wings  # noqa: E402
+from test_hopcroft_karp import legacy_hopcroft_karp, long_path_event  # noqa: E402
+
+
+def measure(function, *args):
+    """Best of three runs for time; peak allocated memory from a separate traced run"""
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        try:
+            result = f'{len(function(*args))} pairs'
+        except RecursionError:
+            result = 'RecursionError'
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function(*args)
+    except RecursionError:
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return f'{min(times):.2f}s, peak {peak / 2 ** 20:.1f} MiB, {result}'
+
+
+def main(degree):
+    rng = random.Random(0)
+    for n in (1000, 5000, 20000):
+        males = list(range(n))
+        females = list(range(n, 2 * n))
+        allowed_pairs = [(m, f) for m in males for f in rng.sample(females, degree)]
+        print(f'{n}x{n}, {len(allowed_pairs)} allowed pairs')
+        print(f'  legacy: {measure(legacy_hopcroft_karp, males, females, allowed_pairs)}')
+        print(f'  csr:    {measure(wings.hopcroft_karp, males, females, allowed_pairs)}')
+
+    males, females, allowed_pairs = long_path_event(20000)
+    print('augmenting path through 20001 males')
+    print(f'  legacy: {measure(legacy_hopcroft_karp, males, females, allowed_pairs)}')
+    print(f'  csr:    {measure(wings.hopcroft_karp, males, females, allowed_pairs)}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,80 @@
+"""
+Benchmark: inserting a round's matches with insert_matches() vs one ORM object per pair.
+
+    TEST_DATABASE_URL=postgresql://... python tests/bench_insert_matches.py
+
+Wipes and migrates the database like the tests do. Each run flushes inside a transaction
+that is rolled back, so every size starts from the same tables.
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['DATABASE_URL'] = os.environ['TEST_DATABASE_URL']
+os.environ.setdefault('MATCHMAKING_WORKERS', '0')
+os.environ.setdefault('CHECKIN_SCHEDULER', 'false')
+
+from flask_migrate import upgrade  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+import app as wings  # noqa: E402
+
+SIZES = (250, 1000, 5000)
+
+
+def setup():
+    with wings.db.engine.begin() as conn:
+        conn.exec_driver_sql('DROP SCHEMA public CASCADE')
+        conn.exec_driver_sql('CREATE SCHEMA public')
+    upgrade(directory=os.path.join(ROOT, 'migrations'))
+    n_users = 2 * max(SIZES)
+    wings.db.session.execute(insert(wings.Task), [
+        {'id': i, 'email': f'user{i}@example.com', 'password': 'secret'} for i in range(1, n_users + 1)
+    ])
+    location = wings.LocationInfo(location='bar', maxAttendees=n_users, current_round=1)
+    wings.db.session.add(location)
+    wings.db.session.commit()
+    return location.id
+
+
+def rows(location_id, n_pairs):
+    return [{
+        'user1_id': i, 'user2_id': n_pairs + i, 'status': 'active', 'matched_expired': False,
+        'location_id': location_id, 'visible_after': 1700000000, 'round_number': 1
+    } for i in range(1, n_pairs + 1)]
+
+
+def orm_add(match_rows):
+    for row in match_rows:
+        wings.db.session.add(wings.Match(**row))
+    wings.db.session.flush()
+
+
+def bulk(match_rows):
+    wings.insert_matches(match_rows)
+
+
+def best_of_three(function, match_rows):
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        function(match_rows)
+        times.append(time.perf_counter() - start)
+        wings.db.session.rollback()
+    return min(times)
+
+
+def main():
+    with wings.app.app_context():
+        location_id = setup()
+        for n_pairs in SIZES:
+            match_rows = rows(location_id, n_pairs)
+            orm = best_of_three(orm_add, match_rows)
+            insert_many = best_of_three(bulk, match_rows)
+            print(f'{n_pairs:5} pairs  ORM add+flush {orm * 1000:5.0f} ms  insert_matches {insert_many * 1000:5.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: scoring every male/female pair with get_match_score vs CompatibilityScorer.
+No database needed.
+
+    python tests/bench_match_scoring.py [users ...]
+
+Runs 1k, 10k and 50k users by default. Above MAX_LOOP_PAIRS pairs the get_match_score loop
+only scores the first rows of males and its time is scaled up to all pairs (marked "est.").
+"""
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import app as wings  # noqa: E402
+from test_match_scoring import random_profile  # noqa: E402
+
+SIZES = (1000, 10000, 50000)
+MAX_LOOP_PAIRS = 5_000_000
+
+
+def main(n_users):
+    rng = random.Random(0)
+    users = [SimpleNamespace(user_auth_id=i, **dict(random_profile(rng), gender=('male', 'female')[i % 2]))
+             for i in range(n_users)]
+    males, females = list(range(0, n_users, 2)), list(range(1, n_users, 2))
+
+    loop_rows = males[:max(1, MAX_LOOP_PAIRS // len(females))]
+    start = time.perf_counter()
+    for row in loop_rows:
+        for col in females:
+            wings.get_match_score(users[row], users[col])
+    loop = (time.perf_counter() - start) * len(males) / len(loop_rows)
+    estimated = ' est.' if len(loop_rows) < len(males) else ''
+
+    start = time.perf_counter()
+    scorer = wings.CompatibilityScorer(users)
+    for block in range(0, len(males), wings.MATCH_SCORE_BLOCK):
+        scorer.scores(males[block:block + wings.MATCH_SCORE_BLOCK], females)
+    vectorised = time.perf_counter() - start
+
+    pairs = len(males) * len(females)
+    print(f'{n_users} users, {pairs} pairs: get_match_score loop {loop:.2f}s{estimated}, '
+          f'CompatibilityScorer {vectorised:.3f}s ({loop / vectorised:.0f}x)')
+
+
+if __name__ == '__main__':
+    for n_users in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        main(n_users)
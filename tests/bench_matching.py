@@ -0,0 +1,41 @@
+"""
+Benchmark: round matching with hopcroft_karp vs max_weight_matching ('weighted' mode).
+No database needed.
+
+    python tests/bench_matching.py [density]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import app as wings  # noqa: E402
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(density):
+    rng = random.Random(0)
+    for n in (100, 250, 500):
+        males = list(range(n))
+        females = list(range(n, 2 * n))
+        allowed_pairs = [(m, f) for m in males for f in females if rng.random() < density]
+        weights = {pair: rng.randint(0, 60) for pair in allowed_pairs}
+
+        unweighted, unweighted_time = timed(wings.hopcroft_karp, males, females, allowed_pairs)
+        weighted, weighted_time = timed(wings.max_weight_matching, males, females, allowed_pairs, weights)
+        print(f'{n}x{n}, {len(allowed_pairs)} allowed pairs: '
+              f'hopcroft_karp {unweighted_time:.3f}s ({len(unweighted)} pairs, '
+              f'score {sum(weights[p] for p in unweighted)}), '
+              f'weighted {weighted_time:.3f}s ({len(weighted)} pairs, score {sum(weights[p] for p in weighted)})')
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.9)
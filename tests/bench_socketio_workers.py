@@ -0,0 +1,161 @@
+"""
+Load test of Socket.IO fan-out across worker processes: messages POSTed to /send_message on random
+workers must reach the receiver's client on whichever worker it is connected to.
+
+    TEST_DATABASE_URL=postgresql://... SOCKETIO_MESSAGE_QUEUE=redis://localhost:6379/1 \\
+        python tests/bench_socketio_workers.py [messages] [clients] [senders]
+
+Wipes and migrates the database like the tests do, then starts 4 worker processes (the app under
+the Socket.IO development server, as with python app.py) that share only the message queue; without
+SOCKETIO_MESSAGE_QUEUE they run unconnected, for comparison. Clients connect round-robin over
+websocket. Reports how many messages were delivered, overall and across workers, and the delivery
+latency percentiles (POST to receive_message, so they include the database commit).
+"""
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import socketio
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['DATABASE_URL'] = os.environ['TEST_DATABASE_URL']
+os.environ.setdefault('MATCHMAKING_WORKERS', '0')
+os.environ.setdefault('CHECKIN_SCHEDULER', 'false')
+
+if sys.argv[1:2] == ['--worker']:
+    import app as wings
+    wings.socketio.run(wings.app, host='127.0.0.1', port=int(sys.argv[2]), log_output=False,
+                       allow_unsafe_werkzeug=True)
+    sys.exit()
+
+MESSAGE_QUEUE = os.environ.pop('SOCKETIO_MESSAGE_QUEUE', None)  # for the workers only
+N_WORKERS = 4
+FIRST_PORT = int(os.environ.get('BENCH_FIRST_PORT', 8700))
+DELIVERY_TIMEOUT = 10  # seconds to wait for the last messages
+
+from flask_migrate import upgrade  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+import app as wings  # noqa: E402
+
+
+def reset(n_users):
+    with wings.app.app_context():
+        with wings.db.engine.begin() as conn:
+            conn.exec_driver_sql('DROP SCHEMA public CASCADE')
+            conn.exec_driver_sql('CREATE SCHEMA public')
+        upgrade(directory=os.path.join(ROOT, 'migrations'))
+        wings.db.session.execute(insert(wings.Task), [
+            {'email': f'user{i}@example.com', 'password': 'secret'} for i in range(n_users)
+        ])
+        wings.db.session.commit()
+        wings.db.engine.dispose()
+
+
+def start_workers():
+    env = dict(os.environ)
+    if MESSAGE_QUEUE:
+        env['SOCKETIO_MESSAGE_QUEUE'] = MESSAGE_QUEUE
+    workers = [subprocess.Popen([sys.executable, __file__, '--worker', str(FIRST_PORT + i)], cwd=ROOT, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+               for i in range(N_WORKERS)]
+    urls = [f'http://127.0.0.1:{FIRST_PORT + i}' for i in range(N_WORKERS)]
+    deadline = time.monotonic() + 30
+    for url in urls:
+        while True:
+            try:
+                requests.get(f'{url}/users?limit=1', timeout=1)
+                break
+            except requests.ConnectionError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f'worker at {url} did not start')
+                time.sleep(0.1)
+    return workers, urls
+
+
+def connect(email, url, on_message):
+    client = socketio.Client()
+    joined = threading.Event()
+    client.on('status', lambda data: joined.set())
+    client.on('receive_message', on_message)
+    client.connect(url, transports=['websocket'])
+    client.emit('join', {'user_email': email})
+    if not joined.wait(5):
+        raise RuntimeError(f'{email} could not join its room')
+    return client
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def main(n_messages, n_clients, n_senders):
+    reset(n_clients)
+    workers, urls = start_workers()
+    clients = []
+    try:
+        sent = {}  # message -> (time posted, worker it was posted to)
+        latencies = {}  # message -> seconds
+        lock = threading.Lock()
+
+        def on_message(data):
+            received = time.perf_counter()
+            with lock:
+                if data['message'] in sent and data['message'] not in latencies:
+                    latencies[data['message']] = received - sent[data['message']][0]
+
+        # Client i is connected to worker i % N_WORKERS
+        clients = [connect(f'user{i}@example.com', urls[i % N_WORKERS], on_message) for i in range(n_clients)]
+
+        rng = random.Random(1)
+        plan = []
+        for seq in range(n_messages):
+            sender, receiver = rng.sample(range(n_clients), 2)
+            plan.append((str(seq), sender, receiver, rng.randrange(N_WORKERS)))
+        sessions = threading.local()
+
+        def post(message, sender, receiver, worker):
+            if not hasattr(sessions, 'http'):
+                sessions.http = requests.Session()
+            with lock:
+                sent[message] = (time.perf_counter(), worker)
+            response = sessions.http.post(f'{urls[worker]}/send_message', data={
+                'sender_email': f'user{sender}@example.com', 'receiver_email': f'user{receiver}@example.com',
+                'message': message})
+            response.raise_for_status()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(n_senders) as pool:
+            list(pool.map(lambda args: post(*args), plan))
+        elapsed = time.perf_counter() - start
+        deadline = time.monotonic() + DELIVERY_TIMEOUT
+        while len(latencies) < n_messages and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        across = [message for message, _, receiver, worker in plan if receiver % N_WORKERS != worker]
+        delivered_across = sum(message in latencies for message in across)
+        print(f'{N_WORKERS} workers, queue {MESSAGE_QUEUE or "none"}, {n_clients} clients, {n_senders} senders: '
+              f'{len(latencies)}/{n_messages} delivered, {delivered_across}/{len(across)} across workers, '
+              f'{n_messages / elapsed:.0f} messages/s')
+        if latencies:
+            values = [seconds * 1000 for seconds in latencies.values()]
+            print('delivery latency: ' + ', '.join(f'p{q} {percentile(values, q):.0f} ms' for q in (50, 95, 99)))
+    finally:
+        with ThreadPoolExecutor(max(len(clients), 1)) as pool:  # each disconnect waits for the socket to close
+            list(pool.map(lambda client: client.disconnect(), clients))
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [1000, 200, 2][len(args):]))
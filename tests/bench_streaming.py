@@ -0,0 +1,77 @@
+"""
+Benchmark: peak RSS of GET /userData buffered vs streamed (?stream=json / ?stream=ndjson)
+and of GET /export/users, for 100k synthetic UserData rows.
+
+    TEST_DATABASE_URL=postgresql://... python tests/bench_streaming.py [rows]
+
+Wipes and migrates the database like the tests do. Each request runs in a fresh process,
+so its peak RSS (ru_maxrss) is not affected by the others.
+"""
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+URLS = ['/userData', '/userData?stream=json', '/userData?stream=ndjson', '/export/users']
+
+
+def setup_app():
+    sys.path.insert(0, ROOT)
+    os.environ['DATABASE_URL'] = os.environ['TEST_DATABASE_URL']
+    os.environ.setdefault('MATCHMAKING_WORKERS', '0')
+    os.environ.setdefault('CHECKIN_SCHEDULER', 'false')
+    import app as wings
+    return wings
+
+
+def load(n_rows):
+    from flask_migrate import upgrade
+    from sqlalchemy import insert
+    wings = setup_app()
+    with wings.app.app_context():
+        with wings.db.engine.begin() as conn:
+            conn.exec_driver_sql('DROP SCHEMA public CASCADE')
+            conn.exec_driver_sql('CREATE SCHEMA public')
+        upgrade(directory=os.path.join(ROOT, 'migrations'))
+        for start in range(0, n_rows, 10000):
+            ids = range(start + 1, min(start + 10000, n_rows) + 1)
+            wings.db.session.execute(insert(wings.Task), [
+                {'id': i, 'email': f'user{i}@example.com', 'password': 'secret'} for i in ids
+            ])
+            wings.db.session.execute(insert(wings.UserData), [
+                {'user_auth_id': i, 'email': f'user{i}@example.com', 'firstname': f'First{i}',
+                 'lastname': 'Last', 'gender': ('male', 'female')[i % 2], 'hobbies': ['music', 'hiking'],
+                 'preferences': ['dates'], 'phone_number': '0700000000', 'age': str(18 + i % 40),
+                 'bio': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 3}
+                for i in ids
+            ])
+            wings.db.session.commit()
+
+
+def run(url):
+    wings = setup_app()
+    client = wings.app.test_client()
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    response = client.get(url, buffered=False)
+    size = sum(len(chunk) for chunk in response.response)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+    print(f'{url:26} {response.status_code} {size / 2 ** 20:7.1f} MiB body {elapsed:6.2f}s '
+          f'peak RSS {peak / 1024:7.1f} MiB (+{(peak - before) / 1024:.1f} MiB for the request)')
+
+
+def main(n_rows):
+    load(n_rows)
+    print(f'{n_rows} UserData rows')
+    for url in URLS:
+        subprocess.run([sys.executable, __file__, 'run', url], check=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == 'run':
+        run(sys.argv[2])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,58 @@
+import pytest
+
+import app as wings
+
+GENDERS = ['male', 'female', 'other', 'Non-binary', 'Female', 'man', 'woman', 'other']
+
+
+@pytest.fixture
+def location(database):
+    def make(max_attendees, shards=0):
+        location = wings.LocationInfo(location='bar', maxAttendees=max_attendees, maleAttendees=0,
+                                      femaleAttendees=0, otherAttendees=0, attendance_shards=shards)
+        database.session.add(location)
+        database.session.flush()
+        wings.create_attendance_shards(location)
+        database.session.commit()
+        return location.id
+    return make
+
+
+def attend(user_id, location_id):
+    return wings.app.test_client().post('/attend', json={'user_id': user_id, 'location_id': location_id})
+
+
+def attendee_counts(client, location_id):
+    data = client.get('/attend', query_string={'location_id': location_id}).get_json()
+    return data, {key: data[key] for key in ('maleAttendees', 'femaleAttendees', 'otherAttendees')}
+
+
+def test_other_genders_take_places(client, make_users, location):
+    location_id = location(2)
+    male, other, female = make_users([{'gender': 'male'}, {'gender': 'other'}, {'gender': 'female'}])
+
+    assert attend(male, location_id).status_code == 200
+    assert attend(other, location_id).status_code == 200
+    response = attend(female, location_id)
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'All 2 places are taken'
+    data, counts = attendee_counts(client, location_id)
+    assert counts == {'maleAttendees': 1, 'femaleAttendees': 0, 'otherAttendees': 1}
+    assert data['totalAttendees'] == 2
+    assert {attendee['user_id'] for attendee in data['attendees']} == {male, other}
+
+
+@pytest.mark.parametrize('shards', [0, 4])
+def test_concurrent_attend_never_over_admits(client, make_users, location, run_in_threads, shards):
+    location_id = location(10, shards)
+    users = make_users([{'gender': GENDERS[i % len(GENDERS)]} for i in range(40)])
+
+    responses = run_in_threads(attend, [(user_id, location_id) for user_id in users])
+
+    admitted = {user_id for user_id, response in zip(users, responses) if response.status_code == 200}
+    assert len(admitted) == 10
+    assert all(response.status_code in (200, 400) for response in responses)
+    data, counts = attendee_counts(client, location_id)
+    assert {attendee['user_id'] for attendee in data['attendees']} == admitted
+    assert data['totalAttendees'] == sum(counts.values()) == 10
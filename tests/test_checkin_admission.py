@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app as wings
+
+
+@pytest.fixture
+def event(database, make_users):
+    """make(attendees, max_attendees, **location fields) -> (location_id, attendee ids)"""
+    def make(attendees, max_attendees, **fields):
+        users = make_users([{'gender': ('male', 'female')[i % 2]} for i in range(attendees)])
+        location = wings.LocationInfo(location='bar', maxAttendees=max_attendees, current_round=1, **fields)
+        database.session.add(location)
+        database.session.flush()
+        database.session.add_all([wings.Attendance(user_id=uid, location_id=location.id, hasAttended=True)
+                                  for uid in users])
+        database.session.commit()
+        return location.id, users
+    return make
+
+
+def scan(user_id, location_id):
+    response = wings.app.test_client().post('/checkin', json={'user_id': user_id, 'location_id': location_id})
+    return response.status_code, response.get_json()
+
+
+def test_concurrent_scans_admit_exactly_max_attendees(event, run_in_threads):
+    location_id, users = event(30, 20)
+
+    # Every ticket is scanned twice at the same time
+    scans = [(user_id, location_id) for user_id in users * 2]
+    results = run_in_threads(scan, scans)
+
+    admitted = [(user_id, body) for (user_id, _), (status, body) in zip(scans, results) if status == 200]
+    assert len(admitted) == 20
+    assert len({user_id for user_id, _ in admitted}) == 20
+    assert all(status in (200, 400) for status, _ in results)
+
+    # Only the scan that took the last slot closed check-in and queued matchmaking
+    closing = [body for _, body in admitted if body['checkin_closed']]
+    assert len(closing) == 1
+    assert closing[0]['checkin_status'] == '20/20 checked in'
+    assert [body.get('matchmaking_job') for _, body in admitted if not body['checkin_closed']] == [None] * 19
+
+    wings.db.session.remove()
+    location = wings.db.session.get(wings.LocationInfo, location_id)
+    assert location.checkin_count == 20 and location.checkin_closed
+    assert wings.CheckIn.query.filter_by(location_id=location_id).count() == 20
+    jobs = wings.MatchmakingJob.query.filter_by(location_id=location_id).all()
+    assert [(job.id, job.reason) for job in jobs] == [(closing[0]['matchmaking_job'], 'checkin_closed')]
+
+
+def test_admission_is_one_statement(event, count_queries):
+    location_id, users = event(3, 10)
+    with count_queries() as statements:
+        status, body = scan(users[0], location_id)
+
+    assert status == 200 and body['checkin_status'] == '1/10 checked in' and not body['checkin_closed']
+    assert len(statements) == 1
+
+
+def test_refused_scans(event, make_users):
+    location_id, users = event(2, 10)
+    (stranger,) = make_users([{'gender': 'male'}])
+    assert scan(users[0], location_id)[0] == 200
+
+    assert scan(users[0], location_id) == (400, {'message': 'User already checked in'})
+    assert scan(stranger, location_id) == (403, {'message': 'User must attend before check-in'})
+    assert scan(users[1], 999) == (404, {'message': 'Invalid location or Id'})
+
+    late_id, late_users = event(2, 10, checkin_closes_at=datetime.now(timezone.utc) - timedelta(minutes=1))
+    assert scan(late_users[0], late_id) == (
+        400, {'message': 'Check-in period has ended (10 minutes after event time)'})
+    assert wings.db.session.get(wings.LocationInfo, late_id).checkin_closed
@@ -0,0 +1,222 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app as wings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def soon(seconds):
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+class Fired:
+    """Scheduler callback that records (key, time it fired)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, key):
+        self.calls.append((key, datetime.now(timezone.utc)))
+
+    @property
+    def keys(self):
+        return [key for key, _ in self.calls]
+
+
+def test_pop_due_with_fixed_clock():
+    scheduler = wings.DeadlineScheduler(Fired())
+    now = datetime(2026, 10, 18, 20, 0, tzinfo=timezone.utc)
+    scheduler.schedule('a', now - timedelta(minutes=5))
+    scheduler.schedule('b', now)
+    scheduler.schedule('c', now + timedelta(seconds=1))
+    scheduler.schedule('d', now - timedelta(minutes=1))
+    scheduler.schedule('d', now + timedelta(minutes=1))  # moved later: the old entry must not fire
+
+    assert scheduler._pop_due(now) == ['a', 'b']
+    assert scheduler._pop_due(now + timedelta(seconds=1)) == ['c']
+    assert scheduler._pop_due(now + timedelta(seconds=59)) == []
+    assert scheduler._pop_due(now + timedelta(minutes=1)) == ['d']
+    assert scheduler._pop_due(now + timedelta(days=1)) == []
+
+
+def test_same_deadline_twice_fires_once():
+    scheduler = wings.DeadlineScheduler(Fired())
+    now = datetime(2026, 10, 18, 20, 0, tzinfo=timezone.utc)
+    scheduler.schedule('a', now)
+    scheduler.schedule('a', now)
+
+    assert scheduler._pop_due(now) == ['a']
+    assert len(scheduler._heap) == 0
+
+
+def test_fires_at_deadline():
+    fired = Fired()
+    scheduler = wings.DeadlineScheduler(fired)
+    deadline = soon(0.1)
+    scheduler.schedule(1, deadline)
+    scheduler.start()
+
+    assert wait_until(lambda: fired.calls)
+    (key, fired_at), = fired.calls
+    assert key == 1
+    assert deadline <= fired_at < deadline + timedelta(seconds=0.5)
+
+
+def test_earlier_deadline_wakes_waiting_thread():
+    fired = Fired()
+    scheduler = wings.DeadlineScheduler(fired)
+    scheduler.schedule('late', soon(60))
+    scheduler.start()
+    time.sleep(0.05)  # the thread now waits for 'late'
+
+    scheduler.schedule('early', soon(0.05))
+
+    assert wait_until(lambda: fired.calls, timeout=1)
+    assert fired.keys == ['early']
+
+
+def test_rescheduling_replaces_old_deadline():
+    fired = Fired()
+    scheduler = wings.DeadlineScheduler(fired)
+    scheduler.schedule(1, soon(0.05))
+    scheduler.schedule(1, soon(0.3))
+    scheduler.start()
+
+    time.sleep(0.2)
+    assert fired.calls == []
+    assert wait_until(lambda: fired.calls)
+    time.sleep(0.1)
+    assert fired.keys == [1]
+
+
+def test_failing_callback_doesnt_stop_the_thread():
+    fired = Fired()
+
+    def callback(key):
+        if key == 'bad':
+            raise RuntimeError('boom')
+        fired(key)
+
+    scheduler = wings.DeadlineScheduler(callback)
+    scheduler.schedule('bad', soon(0))
+    scheduler.schedule('good', soon(0.05))
+    scheduler.start()
+
+    assert wait_until(lambda: fired.calls)
+    assert fired.keys == ['good']
+
+
+def test_periodic_reload():
+    fired = Fired()
+    reloads = []
+    lock = threading.Lock()
+
+    def reload(scheduler):
+        with lock:
+            reloads.append(time.monotonic())
+            if len(reloads) == 2:
+                raise RuntimeError('database is down')  # logged, the next reload still runs
+            if len(reloads) == 3:
+                scheduler.schedule('from reload', soon(0))
+
+    scheduler = wings.DeadlineScheduler(fired, reload=reload, reload_every=0.05)
+    scheduler.start()
+    try:
+        assert wait_until(lambda: len(reloads) >= 4)
+        assert wait_until(lambda: fired.calls)
+        assert fired.keys == ['from reload']
+        gaps = [b - a for a, b in zip(reloads, reloads[1:4])]
+        assert all(gap >= 0.04 for gap in gaps)
+    finally:
+        scheduler.reload_every = 3600  # the thread can't be stopped; let it sleep
+
+
+@pytest.fixture
+def events(database):
+    """make(starts_in, closes_in, checkin_closed=False) -> id of an event (times relative to now)"""
+    def make(starts_in=None, closes_in=None, checkin_closed=False):
+        now = datetime.now(timezone.utc)
+        location = wings.LocationInfo(
+            location='bar', maxAttendees=10, checkin_closed=checkin_closed,
+            starts_at=now + starts_in if starts_in is not None else None,
+            checkin_closes_at=now + closes_in if closes_in is not None else None)
+        database.session.add(location)
+        database.session.commit()
+        return location.id
+    return make
+
+
+class Recorder:
+    def __init__(self):
+        self.scheduled = {}
+
+    def schedule(self, key, deadline):
+        self.scheduled[key] = deadline
+
+
+def test_load_schedules_upcoming_and_overdue_events(events, monkeypatch):
+    monkeypatch.setitem(wings.app.config, 'CHECKIN_SCHEDULER_HORIZON', 3600)
+    hour, day = timedelta(hours=1), timedelta(days=1)
+    upcoming = events(starts_in=hour / 2, closes_in=hour / 2 + timedelta(minutes=10))
+    just_missed = events(starts_in=-hour / 2, closes_in=-hour / 2 + timedelta(minutes=10))
+    long_overdue = events(starts_in=-3 * day, closes_in=-3 * day + timedelta(minutes=10))
+    events(starts_in=2 * hour, closes_in=2 * hour + timedelta(minutes=10))  # beyond the horizon
+    events(starts_in=-3 * day, closes_in=-3 * day, checkin_closed=True)  # closed already
+    events()  # no parsable start time
+
+    recorder = Recorder()
+    wings.load_checkin_deadlines(recorder)
+
+    assert set(recorder.scheduled) == {upcoming, just_missed, long_overdue}
+
+
+def test_overdue_event_closes_on_first_reload(events):
+    overdue = events(starts_in=-timedelta(days=2), closes_in=-timedelta(days=2) + timedelta(minutes=10))
+    scheduler = wings.DeadlineScheduler(wings.close_checkin_at_deadline, reload=wings.load_checkin_deadlines,
+                                        reload_every=3600)
+    scheduler.start()
+
+    def closed():
+        wings.db.session.expire_all()
+        return wings.db.session.get(wings.LocationInfo, overdue).checkin_closed
+
+    assert wait_until(closed)
+    job = wings.MatchmakingJob.query.filter_by(location_id=overdue).one()
+    assert job.reason == 'checkin_deadline'
+
+
+def test_close_at_deadline_is_a_no_op_when_closed(events):
+    location_id = events(starts_in=-timedelta(hours=1), closes_in=-timedelta(minutes=50), checkin_closed=True)
+
+    wings.close_checkin_at_deadline(location_id)
+
+    assert wings.MatchmakingJob.query.count() == 0
+
+
+@pytest.mark.parametrize('from_cli, started', [(False, True), (True, False)])
+def test_scheduler_starts_when_app_loads_except_under_flask_cli(from_cli, started):
+    env = dict(os.environ, DATABASE_URL='sqlite://', CHECKIN_SCHEDULER='true', MATCHMAKING_WORKERS='0')
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    if from_cli:
+        env['FLASK_RUN_FROM_CLI'] = 'true'
+    output = subprocess.run([sys.executable, '-c', 'import app; print(app.checkin_scheduler._thread is not None)'],
+                            cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+
+    assert output.returncode == 0, output.stderr
+    assert output.stdout.strip().splitlines()[-1] == str(started)
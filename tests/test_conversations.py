@@ -0,0 +1,76 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+
+import app as wings
+
+
+@pytest.fixture
+def users(make_users):
+    return make_users([{} for _ in range(8)])
+
+
+def add_messages(pairs):
+    messages = [wings.Message(sender_id=sender, receiver_id=receiver, message=f'{sender} -> {receiver}',
+                              conversation_key=wings.conversation_key(sender, receiver),
+                              timestamp=datetime.now(timezone.utc))
+                for sender, receiver in pairs]
+    wings.db.session.add_all(messages)
+    wings.db.session.flush()
+    return messages
+
+
+def inbox():
+    return {(row.user_id, row.partner_id): (row.unread_count, row.last_message)
+            for row in wings.Conversation.query}
+
+
+def test_upsert_rows_are_sorted(users):
+    pairs = [(users[5], users[1]), (users[0], users[7]), (users[3], users[2]), (users[1], users[5])]
+    messages = add_messages(pairs)
+
+    written = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO conversations'):
+            written.extend((parameters[f'user_id_m{i}'], parameters[f'partner_id_m{i}'])
+                           for i in range(sum(key.startswith('user_id_m') for key in parameters)))
+
+    event.listen(wings.db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        wings.record_conversation_messages(messages)
+    finally:
+        event.remove(wings.db.engine, 'before_cursor_execute', before_cursor_execute)
+    wings.db.session.commit()
+
+    keys = {(a, b) for pair in pairs for a, b in (pair, pair[::-1])}
+    assert written == sorted(keys)
+    assert inbox()[users[5], users[1]] == (1, f'{users[1]} -> {users[5]}')
+    assert inbox()[users[1], users[5]] == (1, f'{users[1]} -> {users[5]}')
+    assert inbox()[users[7], users[0]] == (1, f'{users[0]} -> {users[7]}')
+    assert inbox()[users[0], users[7]] == (0, f'{users[0]} -> {users[7]}')
+
+
+def test_concurrent_batches_dont_deadlock(users, run_in_threads):
+    pairs = [(a, b) for a in users for b in users if a != b]
+    add_messages(pairs[:1])
+    wings.record_conversation_messages(wings.Message.query.all())
+    wings.db.session.commit()
+
+    def send_batches(seed):
+        # Overlapping batches in different orders, like message_flusher in several workers
+        rng = random.Random(seed)
+        with wings.app.app_context():
+            for _ in range(15):
+                batch = rng.sample(pairs, 30)
+                wings.record_conversation_messages(add_messages(batch))
+                wings.db.session.commit()
+
+    run_in_threads(send_batches, [(seed,) for seed in range(8)])
+
+    unread = {}
+    for message in wings.Message.query:
+        unread[message.receiver_id, message.sender_id] = unread.get((message.receiver_id, message.sender_id), 0) + 1
+    assert {key: count for key, (count, _) in inbox().items() if count} == unread
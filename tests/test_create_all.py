@@ -0,0 +1,119 @@
+import pytest
+
+import app as wings
+
+
+@pytest.fixture(params=[False, True], ids=['insert', 'copy'])
+def create_all(request, client):
+    """create_all(entries) -> response json, through INSERT or through the ?copy=true path"""
+    url = '/create_all?copy=true' if request.param else '/create_all'
+
+    def post(entries):
+        response = client.post(url, json={'user_details': entries})
+        assert response.status_code == 201, response.json
+        return response.json
+    return post
+
+
+def accounts():
+    wings.db.session.expire_all()
+    return {task.email: (task.id, task.password) for task in wings.Task.query}
+
+
+def test_create_all_requires_a_list(client):
+    for body in [{}, {'user_details': []}, {'user_details': {'email': 'a@example.com'}}]:
+        response = client.post('/create_all', json=body)
+        assert response.status_code == 400
+        assert response.json == {'error': 'List required'}
+
+
+def test_results_per_row(create_all, make_users):
+    make_users([{'email': 'old@example.com'}])
+
+    body = create_all([
+        {'email': 'new@example.com', 'password': 'a'},
+        {'email': 'old@example.com', 'password': 'b'},
+        {'email': 'not-an-email', 'password': 'c'},
+        {'email': 'nopassword@example.com'},
+        'not an object',
+        {'email': 42, 'password': 'd'},
+        {'email': 'other@example.com', 'password': 'e'},
+    ])
+
+    assert [(r['index'], r['status']) for r in body['results']] == [
+        (0, 'created'), (1, 'duplicate'), (2, 'invalid'), (3, 'invalid'), (4, 'invalid'), (5, 'invalid'),
+        (6, 'created')]
+    assert body['counts'] == {'created': 2, 'duplicate': 1, 'invalid': 4}
+    saved = accounts()
+    assert body['results'][0]['id'] == saved['new@example.com'][0]
+    assert body['results'][6]['id'] == saved['other@example.com'][0]
+    assert 'id' not in body['results'][1]
+    assert saved['old@example.com'][1] == 'secret'  # the existing account is left alone
+
+
+def test_repeated_email_in_one_request(create_all):
+    body = create_all([
+        {'email': 'same@example.com', 'password': 'first'},
+        {'email': 'same@example.com', 'password': 'second'},
+        {'email': 'same@example.com', 'password': 'third'},
+    ])
+
+    assert [r['status'] for r in body['results']] == ['created', 'duplicate', 'duplicate']
+    assert accounts() == {'same@example.com': (body['results'][0]['id'], 'first')}
+
+
+def test_created_ids_are_cached(create_all):
+    body = create_all([{'email': 'cached@example.com', 'password': 'a'}])
+
+    assert wings.email_id_cache.get('cached@example.com') == body['results'][0]['id']
+
+
+def test_existence_check_across_chunks(client, make_users, monkeypatch, count_queries):
+    monkeypatch.setattr(wings, 'CREATE_ALL_CHUNK', 3)
+    # Existing emails on both sides of the chunk boundaries
+    existing = ['u2@example.com', 'u3@example.com', 'u6@example.com']
+    make_users([{'email': email} for email in existing])
+    entries = [{'email': f'u{i}@example.com', 'password': 'pw'} for i in range(8)]
+
+    with count_queries() as statements:
+        response = client.post('/create_all', json={'user_details': entries})
+    assert response.status_code == 201, response.json
+
+    assert [r['status'] for r in response.json['results']] == [
+        'duplicate' if entry['email'] in existing else 'created' for entry in entries]
+    assert len(accounts()) == 8
+    lookups = [s for s in statements if s.startswith('SELECT') and 'userdetails.email IN' in s]
+    inserts = [s for s in statements if s.startswith('INSERT INTO userdetails')]
+    assert len(lookups) == 3  # 8 emails in chunks of 3
+    assert len(inserts) == 2  # 5 new accounts in chunks of 3
+
+
+def test_copy_path_doesnt_use_insert_statements(client, database, count_queries):
+    entries = [{'email': f'u{i}@example.com', 'password': 'pw'} for i in range(5)]
+
+    with count_queries() as statements:
+        response = client.post('/create_all?copy=true', json={'user_details': entries})
+
+    assert response.json['counts'] == {'created': 5, 'duplicate': 0, 'invalid': 0}
+    assert not [s for s in statements if s.startswith('INSERT')]
+    assert set(accounts()) == {entry['email'] for entry in entries}
+
+
+@pytest.mark.parametrize('path', ['insert_accounts', 'copy_accounts'])
+def test_account_created_concurrently_is_duplicate(client, database, monkeypatch, path):
+    insert = getattr(wings, path)
+
+    def insert_after_someone_else(new_accounts):
+        # Another request creates the account between the existence check and the insert
+        with database.engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO userdetails (email, password) VALUES ('race@example.com', 'theirs')")
+        return insert(new_accounts)
+    monkeypatch.setattr(wings, path, insert_after_someone_else)
+
+    url = '/create_all?copy=true' if path == 'copy_accounts' else '/create_all'
+    response = client.post(url, json={'user_details': [{'email': 'race@example.com', 'password': 'mine'},
+                                                       {'email': 'calm@example.com', 'password': 'mine'}]})
+
+    assert response.status_code == 201, response.json
+    assert [r['status'] for r in response.json['results']] == ['duplicate', 'created']
+    assert accounts()['race@example.com'][1] == 'theirs'
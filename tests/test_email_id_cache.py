@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+import app as wings
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    """Fresh lookup counters for /cache_stats"""
+    counters = {'hits': 0, 'negative_hits': 0, 'misses': 0}
+    monkeypatch.setattr(wings, 'email_id_cache_stats', counters)
+    return counters
+
+
+def test_lru_ttl_cache_expires_and_evicts(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(wings.time, 'monotonic', lambda: now[0])
+    cache = wings.LRUTTLCache(max_entries=2, ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=1)
+
+    now[0] += 1
+    assert cache.get('b') is None  # its own, shorter TTL
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    cache.set('d', 4)  # evicts the least recently used entry
+    assert cache.get('a') is None and cache.get('c') == 3 and cache.get('d') == 4
+
+    now[0] += 10
+    assert cache.get('c') is None and cache.get('d') is None
+
+
+def test_negative_entry_expires_after_its_ttl(database, monkeypatch, count_queries):
+    monkeypatch.setitem(wings.app.config, 'EMAIL_ID_CACHE_NEGATIVE_TTL', 0.2)
+    assert wings.user_id_for_email('late@example.com') is None
+    assert wings.email_id_cache.get('late@example.com') == wings.UNKNOWN_EMAIL
+
+    # Created behind the cache's back (e.g. by another worker process)
+    user = wings.Task(email='late@example.com', password='secret')
+    database.session.add(user)
+    database.session.commit()
+    with count_queries() as statements:
+        assert wings.user_id_for_email('late@example.com') is None
+    assert statements == []
+
+    time.sleep(0.25)
+    assert wings.user_id_for_email('late@example.com') == user.id
+    assert wings.email_id_cache.get('late@example.com') == user.id
+
+
+def test_new_account_replaces_negative_entry(client, count_queries):
+    assert wings.user_id_for_email('new@example.com') is None
+
+    response = client.post('/users', json={'email': 'new@example.com', 'password': 'secret'})
+    assert response.status_code == 201, response.json
+
+    user_id = wings.Task.query.filter_by(email='new@example.com').one().id
+    with count_queries() as statements:
+        assert wings.user_id_for_email('new@example.com') == user_id
+    assert statements == []
+
+
+def test_remember_user_ids_overwrites_negative_entry(database):
+    wings.user_ids_for_emails(['a@example.com', 'b@example.com'])
+    assert wings.email_id_cache.get('a@example.com') == wings.UNKNOWN_EMAIL
+
+    wings.remember_user_ids({'a@example.com': 41})
+
+    assert wings.email_id_cache.get('a@example.com') == 41
+    assert wings.email_id_cache.get('b@example.com') == wings.UNKNOWN_EMAIL
+
+
+def test_cache_stats_reports_counters(client, make_users, stats):
+    make_users([{'email': 'known@example.com'}])
+    wings.email_id_cache.clear()
+
+    wings.user_id_for_email('known@example.com')  # miss
+    wings.user_id_for_email('known@example.com')  # hit
+    wings.user_id_for_email('ghost@example.com')  # miss
+    wings.user_ids_for_emails(['ghost@example.com', 'known@example.com'])  # negative hit, hit
+
+    response = client.get('/cache_stats')
+
+    assert response.status_code == 200
+    assert response.json == {'email_id_cache': {'hits': 2, 'negative_hits': 1, 'misses': 2, 'hit_rate': 0.6,
+                                                'entries': 2}}
+
+
+def test_cache_stats_without_lookups(client, stats):
+    assert client.get('/cache_stats').json['email_id_cache']['hit_rate'] is None
@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import app as wings
+
+
+@pytest.fixture
+def chat(make_users):
+    """7 messages between Alice and Bob, interleaved with Alice's chat with Carol: ids of Alice and Bob's"""
+    alice, bob, carol = make_users([{'email': 'alice@example.com'}, {'email': 'bob@example.com'},
+                                    {'email': 'carol@example.com'}])
+    ids = []
+    for i in range(7):
+        sender, receiver = (alice, bob) if i % 2 == 0 else (bob, alice)
+        for s, r in [(sender, receiver), (alice, carol)]:
+            message = wings.Message(sender_id=s, receiver_id=r, message=f'{i}',
+                                    conversation_key=wings.conversation_key(s, r),
+                                    timestamp=datetime.now(timezone.utc))
+            wings.db.session.add(message)
+            wings.db.session.flush()
+            if r != carol:
+                ids.append(message.id)
+    wings.db.session.commit()
+    return ids
+
+
+def get_chats(client, query='', email1='alice@example.com', email2='bob@example.com'):
+    response = client.get(f'/get_chats?email1={email1}&email2={email2}{query}')
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def message_ids(page):
+    return [message['id'] for message in page['messages']]
+
+
+@pytest.mark.parametrize('query', ['&limit=0', '&limit=1001', '&limit=x', '&before=x', '&after=1.5',
+                                   '&before=5&after=2'])
+def test_bad_paging_arguments(client, chat, query):
+    response = client.get(f'/get_chats?email1=alice@example.com&email2=bob@example.com{query}')
+    assert response.status_code == 400
+    assert response.json['error']
+
+
+def test_missing_or_unknown_users(client, chat):
+    assert client.get('/get_chats?email1=alice@example.com').status_code == 400
+    assert client.get('/get_chats?email1=alice@example.com&email2=nobody@example.com&limit=5').status_code == 404
+
+
+def test_unpaginated_history_keeps_old_shape(client, chat):
+    history = get_chats(client)
+
+    assert isinstance(history, list)
+    assert [message['id'] for message in history] == chat
+    assert [message['message'] for message in history] == [str(i) for i in range(7)]
+    assert history[0]['sender_email'] == 'alice@example.com' and history[0]['receiver_email'] == 'bob@example.com'
+    assert history[1]['sender_email'] == 'bob@example.com' and history[1]['receiver_email'] == 'alice@example.com'
+    swapped = get_chats(client, email1='bob@example.com', email2='alice@example.com')
+    assert [message['id'] for message in swapped] == chat
+
+
+def test_limit_alone_returns_latest_page(client, chat):
+    page = get_chats(client, '&limit=3')
+
+    assert message_ids(page) == chat[-3:]
+    assert page['has_more'] is True
+    assert get_chats(client, '&limit=7')['has_more'] is False
+
+
+def test_scrolling_up_with_before(client, chat):
+    pages, query = [], '&limit=3'
+    while True:
+        page = get_chats(client, query)
+        pages.append(message_ids(page))
+        if not page['has_more']:
+            break
+        query = f'&limit=3&before={pages[-1][0]}'
+
+    assert pages == [chat[4:], chat[1:4], chat[:1]]
+
+
+def test_before_with_exactly_limit_older_messages(client, chat):
+    page = get_chats(client, f'&limit=3&before={chat[3]}')
+
+    assert message_ids(page) == chat[:3]
+    assert page['has_more'] is False
+
+
+def test_catching_up_with_after(client, chat):
+    pages, after = [], chat[0]
+    while True:
+        page = get_chats(client, f'&limit=2&after={after}')
+        pages.append(message_ids(page))
+        if not page['has_more']:
+            break
+        after = pages[-1][-1]
+
+    assert pages == [chat[1:3], chat[3:5], chat[5:7]]
+
+    # A message sent after the last page is the next page
+    user_ids = wings.user_ids_for_emails(['alice@example.com', 'bob@example.com'])
+    alice, bob = user_ids['alice@example.com'], user_ids['bob@example.com']
+    late = wings.Message(sender_id=alice, receiver_id=bob, message='late',
+                         conversation_key=wings.conversation_key(alice, bob), timestamp=datetime.now(timezone.utc))
+    wings.db.session.add(late)
+    wings.db.session.commit()
+    page = get_chats(client, f'&limit=2&after={pages[-1][-1]}')
+    assert message_ids(page) == [late.id] and page['has_more'] is False
+
+
+def test_pages_dont_include_other_conversations(client, chat):
+    everything = get_chats(client, '&limit=1000')
+
+    assert message_ids(everything) == chat
+    assert {message['receiver_email'] for message in everything['messages']} <= {'alice@example.com', 'bob@example.com'}
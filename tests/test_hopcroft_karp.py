@@ -0,0 +1,105 @@
+import random
+from collections import deque
+
+import pytest
+
+import app as wings
+
+
+def legacy_hopcroft_karp(males, females, allowed_pairs):
+    """hopcroft_karp before the CSR/explicit-stack rewrite (dicts, float('inf'), recursive dfs)"""
+    graph = {m: [] for m in males}
+    for m, f in allowed_pairs:
+        graph[m].append(f)
+
+    pair_u = {m: None for m in males}
+    pair_v = {f: None for f in females}
+    dist = {}
+
+    def bfs():
+        queue = deque()
+        for u in males:
+            if pair_u[u] is None:
+                dist[u] = 0
+                queue.append(u)
+            else:
+                dist[u] = float('inf')
+        dist[None] = float('inf')
+
+        while queue:
+            u = queue.popleft()
+            if dist[u] < dist[None]:
+                for v in graph[u]:
+                    if dist[pair_v[v]] == float('inf'):
+                        dist[pair_v[v]] = dist[u] + 1
+                        queue.append(pair_v[v])
+        return dist[None] != float('inf')
+
+    def dfs(u):
+        if u is None:
+            return True
+        for v in graph[u]:
+            if dist[pair_v[v]] == dist[u] + 1:
+                if dfs(pair_v[v]):
+                    pair_u[u] = v
+                    pair_v[v] = u
+                    return True
+        dist[u] = float('inf')
+        return False
+
+    while bfs():
+        for u in males:
+            if pair_u[u] is None:
+                dfs(u)
+
+    return [(m, f) for m, f in pair_u.items() if f is not None]
+
+
+def random_event(rng):
+    males = rng.sample(range(1, 1000), rng.randint(0, 40))
+    females = rng.sample(range(1000, 2000), rng.randint(0, 40))
+    density = rng.choice([0.02, 0.1, 0.3, 0.8])
+    allowed_pairs = [(m, f) for m in males for f in females if rng.random() < density]
+    rng.shuffle(allowed_pairs)
+    return males, females, allowed_pairs
+
+
+def long_path_event(n):
+    """
+    Every male but the last-listed one is matched in the first phase, and the only augmenting path
+    then runs through all n + 1 males: m0 - f0 - m1 - f1 - ... - mn - fn.
+    """
+    males = [f'm{i}' for i in range(1, n + 1)] + ['m0']
+    females = [f'f{i}' for i in range(n + 1)]
+    allowed_pairs = [('m0', 'f0')]
+    for i in range(1, n + 1):
+        allowed_pairs.append((f'm{i}', f'f{i - 1}'))
+        allowed_pairs.append((f'm{i}', f'f{i}'))
+    return males, females, allowed_pairs
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_same_matching_as_legacy(seed):
+    males, females, allowed_pairs = random_event(random.Random(seed))
+
+    pairs = wings.hopcroft_karp(males, females, allowed_pairs)
+    assert pairs == legacy_hopcroft_karp(males, females, allowed_pairs)
+    assert set(pairs) <= set(allowed_pairs)
+    assert len({m for m, _ in pairs}) == len({f for _, f in pairs}) == len(pairs)
+
+
+def test_duplicate_ids_and_pairs():
+    males, females = [1, 2, 2, 3], [10, 11, 11]
+    allowed_pairs = [(1, 10), (1, 10), (2, 10), (2, 11), (3, 11)]
+    pairs = wings.hopcroft_karp(males, females, allowed_pairs)
+    assert len(pairs) == len(legacy_hopcroft_karp(list(dict.fromkeys(males)), females, allowed_pairs)) == 2
+
+
+def test_long_augmenting_path_does_not_recurse():
+    males, females, allowed_pairs = long_path_event(5000)
+    with pytest.raises(RecursionError):
+        legacy_hopcroft_karp(males, females, allowed_pairs)
+
+    pairs = wings.hopcroft_karp(males, females, allowed_pairs)
+    assert len(pairs) == 5001
+    assert ('m0', 'f0') in pairs
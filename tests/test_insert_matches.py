@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+import app as wings
+
+
+def match_rows(location_id, pairs, round_number=1):
+    return [{
+        'user1_id': m, 'user2_id': f, 'status': 'active', 'matched_expired': False,
+        'location_id': location_id, 'visible_after': 1700000000, 'round_number': round_number
+    } for m, f in pairs]
+
+
+@pytest.fixture
+def event(database, make_users):
+    """(location_id, male ids, female ids) for a location with 30 + 30 users"""
+    males = make_users([{'gender': 'male'} for _ in range(30)])
+    females = make_users([{'gender': 'female'} for _ in range(30)])
+    location = wings.LocationInfo(location='bar', maxAttendees=100, current_round=1)
+    database.session.add(location)
+    database.session.commit()
+    return location.id, males, females
+
+
+@pytest.fixture
+def emitted(monkeypatch):
+    events = []
+    monkeypatch.setattr(wings.socketio, 'emit', lambda name, payload, room=None: events.append((name, room, payload)))
+    return events
+
+
+def test_insert_matches_returns_rows_in_order(event, count_queries):
+    location_id, males, females = event
+    pairs = [(m, f) for m in males for f in females]
+    random.Random(0).shuffle(pairs)
+
+    with count_queries() as statements:
+        created = wings.insert_matches(match_rows(location_id, pairs))
+    wings.db.session.commit()
+
+    assert [(row.user1_id, row.user2_id) for row in created] == pairs
+    assert len([s for s in statements if s.startswith('INSERT INTO matches')]) == 1  # 900 rows, one statement
+    stored = {match.id: (match.user1_id, match.user2_id, match.location_id, match.round_number, match.status)
+              for match in wings.Match.query}
+    assert stored == {row.id: (row.user1_id, row.user2_id, location_id, 1, 'active') for row in created}
+
+
+def test_new_match_events_are_sent_after_commit(event, emitted):
+    location_id, males, females = event
+    created = wings.insert_matches(match_rows(location_id, list(zip(males[:3], females[:3]))))
+    wings.queue_match_notifications(created)
+    assert emitted == []
+
+    wings.db.session.commit()
+
+    emails = dict(wings.db.session.query(wings.Task.id, wings.Task.email))
+    expected = set()
+    for row in created:
+        expected.add((emails[row.user1_id], row.id, row.user2_id))
+        expected.add((emails[row.user2_id], row.id, row.user1_id))
+    assert {(room, payload['match_id'], payload['matched_user_id']) for name, room, payload in emitted} == expected
+    assert {name for name, _, _ in emitted} == {'new_match'}
+
+
+def test_rollback_drops_new_match_events(event, emitted):
+    location_id, males, females = event
+    wings.queue_match_notifications(wings.insert_matches(match_rows(location_id, [(males[0], females[0])])))
+    wings.db.session.rollback()
+    wings.db.session.commit()
+
+    assert emitted == []
+    assert wings.Match.query.count() == 0
+
+
+def test_start_round_inserts_round_in_one_statement(event, emitted, count_queries):
+    location_id, males, females = event
+    wings.db.session.add_all([wings.CheckIn(user_id=uid, location_id=location_id) for uid in males + females])
+    wings.db.session.commit()
+
+    with count_queries() as statements:
+        wings.advance_round(location_id)
+        wings.db.session.commit()
+
+    assert len([s for s in statements if s.startswith('INSERT INTO matches')]) == 1
+    assert wings.Match.query.filter_by(location_id=location_id, round_number=1, status='active').count() == 30
+    assert len(emitted) == 60
@@ -0,0 +1,177 @@
+"""
+Match feeds in SharedCache, the cache every worker process shares. A dict-backed stand-in with
+the redis get/setex/delete methods takes the place of the redis client.
+"""
+import io
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app as wings
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}  # key -> value
+        self.ttls = {}  # key -> seconds given to the last setex
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+        self.ttls[key] = ttl
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.fixture
+def store(database, monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(wings, 'match_feed_cache', wings.SharedCache(redis, ttl=60))
+    return redis
+
+
+def feed_key(user_id):
+    return f'render-flask:match_feed:{user_id}'
+
+
+@pytest.fixture
+def matched(database, make_users):
+    """Alice and Bob, checked in at a bar with a visible round 1 match: (alice id, bob id, match id, location id)"""
+    alice, bob = make_users([{'gender': 'female', 'email': 'alice@example.com'},
+                             {'gender': 'male', 'email': 'bob@example.com'}])
+    location = wings.LocationInfo(location='bar', maxAttendees=100, current_round=1)
+    database.session.add(location)
+    database.session.flush()
+    match = wings.Match(user1_id=bob, user2_id=alice, status='active', matched_expired=False,
+                        location_id=location.id, round_number=1, visible_after=0)
+    database.session.add_all([match, wings.CheckIn(user_id=alice, location_id=location.id),
+                              wings.CheckIn(user_id=bob, location_id=location.id)])
+    database.session.commit()
+    return alice, bob, match.id, location.id
+
+
+def get_feed(client, email):
+    response = client.get(f'/matches/{email}')
+    assert response.status_code == 200, response.json
+    return response.json['matches']
+
+
+def test_second_read_is_served_from_cache(client, store, matched, count_queries):
+    alice, bob, match_id, _ = matched
+    first = get_feed(client, 'alice@example.com')
+    assert [entry['match_id'] for entry in first] == [match_id]
+    assert feed_key(alice) in store.values
+
+    with count_queries() as statements:
+        second = get_feed(client, 'alice@example.com')
+
+    assert second == first
+    assert not [statement for statement in statements if 'matches' in statement]
+
+
+def test_cached_feed_is_shared_by_workers(client, store, matched):
+    alice, *_ = matched
+    feed = get_feed(client, 'alice@example.com')
+
+    # Another worker process: its own SharedCache on the same store
+    other_worker = wings.SharedCache(store, ttl=60)
+    assert [entry['match_id'] for entry in other_worker.get(f'match_feed:{alice}')] == [feed[0]['match_id']]
+
+
+def prefer(client, matched):
+    response = client.post('/preference', json={'user_email': 'alice@example.com',
+                                                'preferred_user_email': 'bob@example.com', 'preference': 'like'})
+    assert response.status_code == 200, response.json
+
+
+def prefer_batch(client, matched):
+    response = client.post('/preferences/batch', json={'preferences': [
+        {'user_email': 'alice@example.com', 'preferred_user_email': 'bob@example.com', 'preference': 'like'}
+    ]})
+    assert response.status_code == 200, response.json
+
+
+def update_match_status(client, matched):
+    response = client.post('/update_match_status', json={'match_id': matched[2], 'user_email': 'alice@example.com',
+                                                         'decision': 'accept'})
+    assert response.status_code == 200, response.json
+
+
+def post_user_data(client, matched):
+    response = client.post('/userData', json={
+        'email': 'bob@example.com', 'firstname': 'Robert', 'lastname': 'Test', 'gender': 'male', 'hobbies': [],
+        'preferences': [], 'phone_number': '0', 'age': '31', 'bio': 'new bio'})
+    assert response.status_code == 201, response.json
+
+
+def upload_image(client, matched):
+    response = client.post('/upload_image', data={'email': 'bob@example.com',
+                                                  'image': (io.BytesIO(b'jpeg'), 'bob.jpg')})
+    assert response.status_code == 201, response.json
+
+
+def run_matchmaking_job(client, matched):
+    wings.enqueue_matchmaking(matched[3], 'round_complete')
+    wings.db.session.commit()
+    job_id = wings.claim_matchmaking_job()
+    wings.run_matchmaking_job(job_id)
+    assert wings.db.session.get(wings.MatchmakingJob, job_id).status == 'done'
+
+
+@pytest.mark.parametrize('write, invalidated', [
+    (prefer, {'alice', 'bob'}),
+    (prefer_batch, {'alice', 'bob'}),
+    (update_match_status, {'alice', 'bob'}),
+    (post_user_data, {'alice'}),  # Bob's profile is shown in Alice's feed
+    (upload_image, {'alice'}),
+    (run_matchmaking_job, {'alice', 'bob'}),  # everyone checked in at the location
+], ids=lambda value: getattr(value, '__name__', None))
+def test_writes_invalidate_affected_feeds(client, store, matched, write, invalidated, tmp_path, monkeypatch):
+    monkeypatch.setitem(wings.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    users = {'alice': matched[0], 'bob': matched[1]}
+    for name in users:
+        get_feed(client, f'{name}@example.com')
+    assert all(feed_key(user_id) in store.values for user_id in users.values())
+
+    write(client, matched)
+
+    assert {name for name, user_id in users.items() if feed_key(user_id) not in store.values} == invalidated
+
+
+def test_invalidated_feed_is_rebuilt(client, store, matched):
+    get_feed(client, 'alice@example.com')
+    post_user_data(client, matched)
+
+    assert get_feed(client, 'alice@example.com')[0]['bio'] == 'new bio'
+
+
+def test_ttl_is_the_configured_ttl_without_upcoming_matches(client, store, matched):
+    alice, *_ = matched
+    get_feed(client, 'alice@example.com')
+
+    assert store.ttls[feed_key(alice)] == 60
+
+
+def test_ttl_is_capped_at_next_visible_after(client, store, matched, make_users):
+    alice, *_ = matched
+    (carl,) = make_users([{'gender': 'male'}])
+    visible_after = wings.get_unix_timestamp(datetime.now(timezone.utc) + timedelta(seconds=20))
+    wings.db.session.add(wings.Match(user1_id=carl, user2_id=alice, status='active', matched_expired=False,
+                                     round_number=2, visible_after=visible_after))
+    wings.db.session.commit()
+
+    feed = get_feed(client, 'alice@example.com')
+
+    assert [entry['user_id'] for entry in feed] == [matched[1]]  # Carl's match isn't visible yet
+    assert 18 <= store.ttls[feed_key(alice)] <= 20
+    assert store.ttls[feed_key(alice)] <= visible_after - time.time() + 1
+
+
+def test_ttl_is_at_least_one_second(store):
+    wings.match_feed_cache.set('match_feed:1', [], ttl=0.2)
+
+    assert store.ttls[feed_key(1)] == 1
@@ -0,0 +1,48 @@
+import pytest
+
+import app as wings
+
+
+def add_matches(make_users, n_matches, location_id):
+    """A checked-in user with n_matches active, visible matches; every partner has a full profile"""
+    user_id, *partners = make_users([{'gender': 'female'}] + [{'gender': 'male'}] * n_matches)
+    for partner_id in partners:
+        wings.db.session.add_all([
+            wings.UserImages(user_auth_id=partner_id, imageString=f'{partner_id}.jpg'),
+            wings.RelationshipData(user_auth_id=partner_id, lookingfor='friends', openfor='dates'),
+            wings.CheckIn(user_id=partner_id, location_id=location_id),
+            wings.Match(user1_id=partner_id, user2_id=user_id, status='active', matched_expired=False,
+                        location_id=location_id, round_number=1, visible_after=0),
+        ])
+    wings.db.session.add(wings.CheckIn(user_id=user_id, location_id=location_id))
+    wings.db.session.commit()
+    return user_id
+
+
+def feed_statements(client, count_queries, url):
+    wings.match_feed_cache.clear()
+    wings.email_id_cache.clear()
+    with count_queries() as statements:
+        response = client.get(url)
+    assert response.status_code == 200, response.json
+    return len(statements), response.json
+
+
+@pytest.mark.parametrize('endpoint', ['email', 'id', 'location'])
+def test_match_feed_query_count_does_not_grow_with_matches(client, make_users, count_queries, endpoint):
+    counts = {}
+    for n_matches in (2, 25):
+        location = wings.LocationInfo(location='bar', maxAttendees=100, current_round=1)
+        wings.db.session.add(location)
+        wings.db.session.commit()
+        user_id = add_matches(make_users, n_matches, location.id)
+        email = wings.db.session.get(wings.Task, user_id).email
+
+        url = {'email': f'/matches/{email}', 'id': f'/match/{user_id}',
+               'location': f'/matches_at_location/{user_id}/{location.id}'}[endpoint]
+        counts[n_matches], body = feed_statements(client, count_queries, url)
+        assert len(body['matches']) == n_matches
+        assert all(match['image_url'] for match in body['matches'])
+
+    assert counts[2] == counts[25]
+    assert counts[25] <= 6
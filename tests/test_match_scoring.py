@@ -0,0 +1,88 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+import app as wings
+
+HOBBIES = ['music', 'hiking', 'travel', 'cooking', 'gaming', 'art', 'sport', 'books']
+OPPOSITE = {'men': 'women', 'man': 'woman', 'male': 'female', 'women': 'men', 'woman': 'man', 'female': 'male'}
+
+
+def random_profile(rng):
+    return {
+        'gender': rng.choice(['male', 'female', 'Male', 'female', 'other', None]),
+        'age': rng.choice([str(rng.randint(18, 60)), str(rng.randint(18, 60)), '25.5', 'n/a', '', None]),
+        'hobbies': rng.sample(HOBBIES, rng.randint(0, 5)) + rng.choice([[], ['music']]),  # with repeats
+    }
+
+
+def legacy_match_all_users(all_users, match_pairs, preference_pairs):
+    """The per-pair loop match_all_users used before CompatibilityScorer: {user_id: (match_id, score)}"""
+    matched_pairs = set()
+    for user1_id, user2_id in match_pairs:
+        matched_pairs.add((user1_id, user2_id))
+        matched_pairs.add((user2_id, user1_id))
+
+    gender_groups = {}
+    for user in all_users:
+        gender_groups.setdefault(user.gender.lower() if user.gender else 'unknown', []).append(user)
+
+    matches, used_users = {}, set()
+    for user in all_users:
+        if user.user_auth_id in used_users:
+            continue
+        opposite_gender = OPPOSITE.get(user.gender.lower() if user.gender else 'unknown')
+        if not opposite_gender or opposite_gender not in gender_groups:
+            continue
+
+        best_score, best_match = -1, None
+        for potential_match in gender_groups[opposite_gender]:
+            if ((user.user_auth_id, potential_match.user_auth_id) in matched_pairs or
+                    (user.user_auth_id, potential_match.user_auth_id) in preference_pairs or
+                    (potential_match.user_auth_id, user.user_auth_id) in preference_pairs or
+                    potential_match.user_auth_id in matches):
+                continue
+            score = wings.get_match_score(user, potential_match)
+            if score > best_score:
+                best_score, best_match = score, potential_match
+
+        if best_match:
+            matches[user.user_auth_id] = (best_match.user_auth_id, best_score)
+            matches[best_match.user_auth_id] = (user.user_auth_id, best_score)
+            used_users.update((user.user_auth_id, best_match.user_auth_id))
+    return matches
+
+
+def test_scorer_matches_get_match_score():
+    rng = random.Random(1)
+    users = [SimpleNamespace(user_auth_id=i, **random_profile(rng)) for i in range(120)]
+    scorer = wings.CompatibilityScorer(users)
+
+    rows, cols = list(range(0, 120, 2)), list(range(120))
+    expected = np.array([[wings.get_match_score(users[r], users[c]) for c in cols] for r in rows])
+    assert (scorer.scores(rows, cols) == expected).all()
+
+
+def test_match_all_users_matches_legacy_loop(database, make_users, monkeypatch):
+    rng = random.Random(2)
+    ids = make_users([random_profile(rng) for _ in range(80)])
+
+    # Existing matches and preferences exclude pairs
+    males = [user.user_auth_id for user in wings.UserData.query if (user.gender or '').lower() == 'male']
+    females = [user.user_auth_id for user in wings.UserData.query if (user.gender or '').lower() == 'female']
+    match_pairs = {(rng.choice(males), rng.choice(females)) for _ in range(15)}
+    preference_pairs = {(rng.choice(ids), rng.choice(ids)) for _ in range(30)} - {(a, a) for a in ids}
+    for user1_id, user2_id in match_pairs:
+        database.session.add(wings.Match(user1_id=user1_id, user2_id=user2_id, status='deleted'))
+    for user_id, preferred_user_id in preference_pairs:
+        database.session.add(wings.UserPreference(user_id=user_id, preferred_user_id=preferred_user_id,
+                                                  preference='reject'))
+    database.session.commit()
+
+    monkeypatch.setattr(wings, 'MATCH_SCORE_BLOCK', 16)  # several blocks
+    matches = wings.match_all_users()
+
+    expected = legacy_match_all_users(wings.UserData.query.all(), match_pairs, preference_pairs)
+    assert expected
+    assert {user_id: (match['match_id'], match['score']) for user_id, match in matches.items()} == expected
@@ -0,0 +1,71 @@
+import random
+from itertools import permutations
+
+import numpy as np
+
+import app as wings
+
+
+def random_graph(rng, n_males, n_females, density):
+    males = [f'm{i}' for i in range(n_males)]
+    females = [f'f{j}' for j in range(n_females)]
+    allowed_pairs = [(m, f) for m in males for f in females if rng.random() < density]
+    return males, females, allowed_pairs
+
+
+def brute_force_best(allowed_pairs, weights):
+    """(size, total weight) of the best matching: most pairs first, then the highest total weight"""
+    best = (0, 0)
+
+    def extend(i, used_males, used_females, size, total):
+        nonlocal best
+        best = max(best, (size, total))
+        for k in range(i, len(allowed_pairs)):
+            m, f = allowed_pairs[k]
+            if m not in used_males and f not in used_females:
+                extend(k + 1, used_males | {m}, used_females | {f}, size + 1, total + weights[(m, f)])
+
+    extend(0, frozenset(), frozenset(), 0, 0)
+    return best
+
+
+def assert_matching(pairs, allowed_pairs):
+    assert set(pairs) <= set(allowed_pairs)
+    assert len({m for m, _ in pairs}) == len(pairs)
+    assert len({f for _, f in pairs}) == len(pairs)
+
+
+def test_hungarian_finds_minimum_cost_assignment():
+    rng = np.random.default_rng(3)
+    for n, m in [(1, 1), (3, 3), (4, 6), (6, 6), (5, 7)]:
+        for _ in range(20):
+            cost = rng.integers(0, 10, size=(n, m)).astype(float)  # small range: many ties
+            col_for_row = wings._hungarian(cost)
+            assert len(set(col_for_row)) == n
+            best = min(sum(cost[i, cols[i]] for i in range(n)) for cols in permutations(range(m), n))
+            assert cost[np.arange(n), col_for_row].sum() == best
+
+
+def test_max_weight_matching_is_maximum_and_heaviest():
+    rng = random.Random(4)
+    for _ in range(150):
+        males, females, allowed_pairs = random_graph(rng, rng.randint(1, 6), rng.randint(1, 6), rng.random())
+        weights = {pair: rng.choice([0, 10, 20, 30, 40, 50, 60]) for pair in allowed_pairs}
+
+        pairs = wings.max_weight_matching(males, females, allowed_pairs, weights)
+        assert_matching(pairs, allowed_pairs)
+        assert (len(pairs), sum(weights[p] for p in pairs)) == brute_force_best(allowed_pairs, weights)
+
+
+def test_max_weight_matching_keeps_hopcroft_karp_size():
+    # Larger random events: as many pairs as the unweighted matcher, and at least its total score
+    rng = random.Random(5)
+    for n_males, n_females, density in [(40, 40, 0.1), (60, 45, 0.5), (80, 100, 0.9)]:
+        males, females, allowed_pairs = random_graph(rng, n_males, n_females, density)
+        weights = {pair: rng.randint(0, 60) for pair in allowed_pairs}
+
+        weighted = wings.max_weight_matching(males, females, allowed_pairs, weights)
+        unweighted = wings.hopcroft_karp(males, females, allowed_pairs)
+        assert_matching(weighted, allowed_pairs)
+        assert len(weighted) == len(unweighted)
+        assert sum(weights[p] for p in weighted) >= sum(weights[p] for p in unweighted)
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app as wings
+
+
+@pytest.fixture
+def location_id(database, monkeypatch):
+    monkeypatch.setitem(wings.app.config, 'MATCHMAKING_MAX_ATTEMPTS', 3)
+    monkeypatch.setitem(wings.app.config, 'MATCHMAKING_RETRY_SECONDS', 10)
+    location = wings.LocationInfo(location='bar', maxAttendees=10, current_round=1)
+    database.session.add(location)
+    database.session.commit()
+    return location.id
+
+
+@pytest.fixture
+def failing_rounds(monkeypatch):
+    """failing_rounds(n): the next n advance_round calls raise"""
+    def fail(n):
+        calls = []
+        real_advance_round = wings.advance_round
+
+        def advance_round(location_id):
+            calls.append(location_id)
+            if len(calls) <= n:
+                raise RuntimeError(f'database hiccup {len(calls)}')
+            return real_advance_round(location_id)
+        monkeypatch.setattr(wings, 'advance_round', advance_round)
+        return calls
+    return fail
+
+
+def queue_job(location_id):
+    job_id = wings.enqueue_matchmaking(location_id, 'requested')
+    wings.db.session.commit()
+    return job_id
+
+
+def run_next_job():
+    job_id = wings.claim_matchmaking_job()
+    if job_id:
+        wings.run_matchmaking_job(job_id)
+    return job_id
+
+
+def make_due(job_id):
+    job = wings.db.session.get(wings.MatchmakingJob, job_id)
+    job.run_after = datetime.now(timezone.utc) - timedelta(seconds=1)
+    wings.db.session.commit()
+
+
+def test_failed_job_is_retried_with_backoff(location_id, failing_rounds):
+    failing_rounds(2)
+    job_id = queue_job(location_id)
+
+    before = datetime.now(timezone.utc)
+    assert run_next_job() == job_id
+    job = wings.db.session.get(wings.MatchmakingJob, job_id)
+    assert (job.status, job.attempts, job.error) == ('queued', 1, 'database hiccup 1')
+    assert before + timedelta(seconds=10) <= job.run_after <= datetime.now(timezone.utc) + timedelta(seconds=10)
+    assert run_next_job() is None  # not due yet
+
+    make_due(job_id)
+    assert run_next_job() == job_id
+    job = wings.db.session.get(wings.MatchmakingJob, job_id)
+    assert (job.status, job.attempts) == ('queued', 2)
+    assert job.run_after > datetime.now(timezone.utc) + timedelta(seconds=15)  # 20 s: the delay doubled
+
+    make_due(job_id)
+    assert run_next_job() == job_id
+    job = wings.db.session.get(wings.MatchmakingJob, job_id)
+    assert (job.status, job.attempts) == ('done', 3)
+    assert job.result['location_id'] == location_id
+
+
+def test_job_fails_after_max_attempts(location_id, failing_rounds):
+    calls = failing_rounds(10)
+    job_id = queue_job(location_id)
+
+    for _ in range(3):
+        make_due(job_id)
+        assert run_next_job() == job_id
+
+    job = wings.db.session.get(wings.MatchmakingJob, job_id)
+    assert (job.status, job.attempts, job.error) == ('failed', 3, 'database hiccup 3')
+    assert job.finished_at is not None
+    make_due(job_id)
+    assert run_next_job() is None
+    assert len(calls) == 3
+
+    # The location isn't stuck: the next trigger queues a new job
+    assert queue_job(location_id) != job_id
+
+
+def test_no_retry_when_location_has_a_queued_job(location_id, failing_rounds):
+    failing_rounds(1)
+    job_id = queue_job(location_id)
+    assert wings.claim_matchmaking_job() == job_id
+    other_job_id = queue_job(location_id)  # triggered while the first job runs
+
+    wings.run_matchmaking_job(job_id)
+
+    job = wings.db.session.get(wings.MatchmakingJob, job_id)
+    assert job.status == 'failed'
+    assert job.error == f'database hiccup 1 (not retried: job {other_job_id} is queued)'
+    assert run_next_job() == other_job_id
+    assert wings.db.session.get(wings.MatchmakingJob, other_job_id).status == 'done'
+
+
+def test_triggers_reuse_job_waiting_for_retry(location_id, failing_rounds):
+    failing_rounds(1)
+    job_id = queue_job(location_id)
+    run_next_job()
+
+    assert queue_job(location_id) == job_id
+    response = wings.app.test_client().get(f'/matchmaking_jobs/{job_id}')
+    assert response.get_json()['status'] == 'queued'
+    assert response.get_json()['run_after'] is not None
@@ -0,0 +1,62 @@
+import threading
+import time
+from queue import Queue
+
+import pytest
+
+import app as wings
+
+
+@pytest.fixture
+def small_queue(monkeypatch):
+    """A 2-message queue and no flusher thread, so tests decide when messages leave the queue"""
+    queue = Queue(maxsize=2)
+    monkeypatch.setattr(wings, 'pending_messages', queue)
+    monkeypatch.setattr(wings, 'start_message_flusher', lambda: None)
+    monkeypatch.setitem(wings.app.config, 'MESSAGE_FLUSH_INTERVAL_MS', 100)
+    return queue
+
+
+def test_queue_holds_one_flush_batch_by_default():
+    assert wings.app.config['MESSAGE_QUEUE_SIZE'] == wings.app.config['MESSAGE_FLUSH_BATCH']
+    assert wings.pending_messages.maxsize == wings.app.config['MESSAGE_QUEUE_SIZE']
+
+
+def test_full_queue_waits_one_interval_then_refuses(small_queue):
+    assert wings.queue_message(1, 2, 'first')
+    assert wings.queue_message(1, 2, 'second')
+
+    start = time.monotonic()
+    assert not wings.queue_message(1, 2, 'third')
+    assert time.monotonic() - start >= 0.1
+    assert small_queue.qsize() == 2
+
+
+def test_full_queue_accepts_once_flusher_takes_a_batch(small_queue):
+    wings.queue_message(1, 2, 'first')
+    wings.queue_message(1, 2, 'second')
+    taken = []
+    flusher = threading.Timer(0.02, lambda: taken.extend([small_queue.get(), small_queue.get()]))
+    flusher.start()
+
+    start = time.monotonic()
+    assert wings.queue_message(1, 2, 'third')
+    assert time.monotonic() - start < 0.1
+    flusher.join()
+    assert [entry['row']['message'] for entry in taken] == ['first', 'second']
+    assert small_queue.get_nowait()['row']['message'] == 'third'
+
+
+def test_full_queue_saves_socket_message_synchronously(database, make_users, small_queue, monkeypatch):
+    monkeypatch.setitem(wings.app.config, 'MESSAGE_WRITE_BEHIND', True)
+    make_users([{'email': 'a@example.com'}, {'email': 'b@example.com'}])
+    client = wings.socketio.test_client(wings.app)
+    data = {'sender_email': 'a@example.com', 'receiver_email': 'b@example.com'}
+
+    for i in range(3):
+        client.emit('send_message', dict(data, message=f'hi {i}', client_id=f'c{i}'))
+
+    saved = [packet['args'][0] for packet in client.get_received() if packet['name'] == 'message_saved']
+    assert [(ack['client_id'], ack['status']) for ack in saved] == [('c2', 'saved')]
+    assert [message.message for message in wings.Message.query] == ['hi 2']
+    assert small_queue.qsize() == 2
@@ -0,0 +1,37 @@
+import os
+import time
+
+import pytest
+from flask_migrate import downgrade, upgrade
+
+import app as wings
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+@pytest.fixture
+def local_time(monkeypatch):
+    """Server local time with daylight saving time"""
+    monkeypatch.setenv('TZ', 'Europe/Stockholm')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_checkin_deadline_backfill_matches_event_start(database, local_time):
+    events = [('2026-06-01', '20:00'), ('2026-10-25', '02:55'), ('2026-03-29', '01:55'), ('soon', '20:00')]
+    try:
+        downgrade(directory=MIGRATIONS, revision='662d748aa026')
+        with wings.db.engine.begin() as conn:
+            for date, event_time in events:
+                conn.exec_driver_sql('INSERT INTO "locationInfo" (date, time) VALUES (%s, %s)', (date, event_time))
+        upgrade(directory=MIGRATIONS, revision='cd27cfff9656')
+        with wings.db.engine.begin() as conn:
+            deadlines = [row[0] for row in conn.exec_driver_sql(
+                'SELECT checkin_closes_at FROM "locationInfo" ORDER BY id')]
+    finally:
+        upgrade(directory=MIGRATIONS)
+
+    expected = [wings.event_start(date, event_time) for date, event_time in events]
+    assert deadlines == [start + wings.CHECKIN_GRACE if start else None for start in expected]
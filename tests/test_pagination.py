@@ -0,0 +1,148 @@
+import json
+
+import pytest
+
+import app as wings
+
+# url -> (key of the unpaginated response, None for a bare list; key of a page)
+ENDPOINTS = {
+    '/users': ('user_details', 'user_details'),
+    '/sign-in': (None, 'items'),
+    '/userData': ('users', 'users'),
+    '/relationshipData': (None, 'items'),
+    '/locationInfo': (None, 'items'),
+}
+
+
+@pytest.fixture
+def rows(database, make_users, monkeypatch):
+    monkeypatch.setattr(wings, 'get_unix_timestamp', lambda dt: 1_700_000_000)  # current_server_time of each user
+    ids = make_users([{'gender': 'female'}, {'gender': 'male'}] * 4)
+    database.session.add_all([wings.RelationshipData(user_auth_id=uid, email=f'{uid}@example.com',
+                                                     lookingfor='friends', openfor='dates') for uid in ids])
+    locations = [wings.LocationInfo(location=f'bar {i}', maxAttendees=10) for i in range(10)]
+    database.session.add_all(locations)
+    database.session.flush()
+    # Holes in the id sequence, like deleted rows
+    database.session.delete(locations[2])
+    database.session.delete(locations[7])
+    database.session.commit()
+    return ids
+
+
+def get(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def unpaginated(client, url):
+    body = get(client, url)
+    key = ENDPOINTS[url][0]
+    return body[key] if key else body
+
+
+def walk(client, url, limit, cursor=None):
+    """Follows next_cursor from the cursor (or the first page) to the last page: list of pages"""
+    pages = []
+    while True:
+        page = get(client, f'{url}?limit={limit}' + (f'&cursor={cursor}' if cursor else ''))
+        pages.append(page[ENDPOINTS[url][1]])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+@pytest.mark.parametrize('args', ['limit=0', 'limit=1001', 'limit=-5', 'limit=ten', 'cursor=abc'])
+def test_bad_paging_arguments(client, rows, url, args):
+    response = client.get(f'{url}?{args}')
+    assert response.status_code == 400
+    assert response.json['error']
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_limit_bounds(client, rows, url):
+    total = len(unpaginated(client, url))
+
+    assert len(get(client, f'{url}?limit=1')[ENDPOINTS[url][1]]) == 1
+    page = get(client, f'{url}?limit={wings.MAX_PAGE_SIZE}')
+    assert len(page[ENDPOINTS[url][1]]) == total and page['next_cursor'] is None
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_cursor_without_limit_uses_default_page_size(client, rows, url, monkeypatch):
+    monkeypatch.setattr(wings, 'DEFAULT_PAGE_SIZE', 2)
+    everything = unpaginated(client, url)
+
+    page = get(client, f'{url}?cursor=')
+
+    assert page[ENDPOINTS[url][1]] == everything[:2]
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+@pytest.mark.parametrize('limit', [1, 3, 8])
+def test_pages_cover_every_row_once(client, rows, url, limit):
+    everything = unpaginated(client, url)
+
+    pages = walk(client, url, limit)
+
+    assert [item for page in pages for item in page] == everything
+    assert all(len(page) == limit for page in pages[:-1]) and 0 < len(pages[-1]) <= limit
+
+
+def test_rows_added_while_paging_come_after_the_cursor(client, rows):
+    first = get(client, '/locationInfo?limit=4')
+    wings.db.session.add(wings.LocationInfo(location='new bar', maxAttendees=10))
+    wings.db.session.commit()
+
+    rest = walk(client, '/locationInfo', 4, cursor=first['next_cursor'])
+
+    seen = [item['location'] for page in [first['items']] + rest for item in page]
+    assert len(seen) == len(set(seen)) == 9
+    assert seen[-1] == 'new bar'
+
+
+def test_next_cursor_is_last_id_of_the_page(client, rows):
+    page = get(client, '/locationInfo?limit=2&cursor=1')
+
+    assert [item['id'] for item in page['items']] == [2, 4]  # 3 was deleted
+    assert page['next_cursor'] == '4'
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_fields_projection(client, rows, url):
+    everything = unpaginated(client, url)
+
+    page = get(client, f'{url}?limit=3&fields=id,no_such_field')
+
+    assert page[ENDPOINTS[url][1]] == [{'id': item['id']} for item in everything[:3]]
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_unpaginated_mode_keeps_original_shape(client, rows, url):
+    body = get(client, url)
+    key = ENDPOINTS[url][0]
+
+    if key:
+        assert list(body) == [key] and isinstance(body[key], list)
+    else:
+        assert isinstance(body, list)
+    # Without limit or cursor, fields doesn't change the response
+    assert get(client, f'{url}?fields=id') == body
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_ndjson_stream_has_every_row(client, rows, url, monkeypatch):
+    monkeypatch.setattr(wings, 'STREAM_BATCH_SIZE', 3)  # several partitions
+    everything = unpaginated(client, url)
+
+    response = client.get(f'{url}?stream=ndjson&fields=id')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert [json.loads(line) for line in response.get_data(as_text=True).splitlines()] == \
+        [{'id': item['id']} for item in everything]
+    streamed = client.get(url, headers={'Accept': 'application/x-ndjson'})
+    assert streamed.mimetype == 'application/x-ndjson'
+    assert len(streamed.get_data(as_text=True).splitlines()) == len(everything)
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta, timezone
+
+import app as wings
+
+
+def test_batch_reject_only_deletes_latest_match(client, make_users):
+    alice, bob = make_users([{'gender': 'female', 'email': 'alice@example.com'},
+                             {'gender': 'male', 'email': 'bob@example.com'}])
+    now = datetime.now(timezone.utc)
+    older = wings.Match(user1_id=bob, user2_id=alice, status='expired', consent='active',
+                        matched_expired=True, match_date=now - timedelta(days=7))
+    latest = wings.Match(user1_id=bob, user2_id=alice, status='expired', consent='pending',
+                         matched_expired=True, match_date=now)
+    wings.db.session.add_all([older, latest])
+    wings.db.session.commit()
+
+    response = client.post('/preferences/batch', json={'preferences': [
+        {'user_email': 'alice@example.com', 'preferred_user_email': 'bob@example.com', 'preference': 'reject'}
+    ]})
+    assert response.status_code == 200, response.json
+    assert response.json['results'][0]['status'] == 'saved'
+
+    wings.db.session.expire_all()
+    assert wings.db.session.get(wings.Match, latest.id).consent == 'deleted'
+    assert wings.db.session.get(wings.Match, older.id).consent == 'active'
+
+
+def batch(client, *items):
+    response = client.post('/preferences/batch', json={'preferences': [
+        {'user_email': user, 'preferred_user_email': other, 'preference': preference}
+        for user, other, preference in items
+    ]})
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def preferences():
+    wings.db.session.expire_all()
+    emails = dict(wings.db.session.query(wings.Task.id, wings.Task.email))
+    return {(emails[p.user_id], emails[p.preferred_user_id]): p.preference for p in wings.UserPreference.query}
+
+
+def start_location(database, make_users, name):
+    """A location with one man and one woman in a running round: (location_id, man email, woman email)"""
+    man, woman = f'{name}-m@example.com', f'{name}-f@example.com'
+    ids = make_users([{'gender': 'male', 'email': man}, {'gender': 'female', 'email': woman}])
+    location = wings.LocationInfo(location=name, maxAttendees=100, current_round=1)
+    database.session.add(location)
+    database.session.flush()
+    database.session.add_all([wings.CheckIn(user_id=uid, location_id=location.id) for uid in ids])
+    database.session.commit()
+    wings.advance_round(location.id)
+    database.session.commit()
+    return location.id, man, woman
+
+
+def test_batch_requires_a_list(client):
+    for body in [{}, {'preferences': []}, {'preferences': {'user_email': 'a@example.com'}}]:
+        response = client.post('/preferences/batch', json=body)
+        assert response.status_code == 400
+        assert response.json == {'error': 'List required'}
+
+
+def test_batch_reports_status_per_item(client, make_users):
+    make_users([{'email': 'alice@example.com'}, {'email': 'bob@example.com'}])
+
+    response = client.post('/preferences/batch', json={'preferences': [
+        {'user_email': 'alice@example.com', 'preferred_user_email': 'bob@example.com', 'preference': 'like'},
+        {'user_email': 'alice@example.com', 'preferred_user_email': 'bob@example.com'},
+        'not an object',
+        {'user_email': 'bob@example.com', 'preferred_user_email': 'alice@example.com', 'preference': 'love'},
+        {'user_email': 'bob@example.com', 'preferred_user_email': 'nobody@example.com', 'preference': 'like'},
+        {'user_email': 'bob@example.com', 'preferred_user_email': 'alice@example.com', 'preference': 'save_later'},
+    ]})
+
+    assert response.status_code == 200, response.json
+    assert [(r['index'], r['status']) for r in response.json['results']] == [
+        (0, 'saved'), (1, 'missing_fields'), (2, 'missing_fields'), (3, 'invalid_preference'),
+        (4, 'user_not_found'), (5, 'saved')]
+    assert response.json['message'] == '2 preferences saved'
+    assert response.json['rounds'] == []
+    assert preferences() == {('alice@example.com', 'bob@example.com'): 'like',
+                             ('bob@example.com', 'alice@example.com'): 'save_later'}
+
+
+def test_batch_upserts_instead_of_duplicating(client, make_users):
+    make_users([{'email': 'alice@example.com'}, {'email': 'bob@example.com'}])
+
+    batch(client, ('alice@example.com', 'bob@example.com', 'like'))
+    batch(client, ('alice@example.com', 'bob@example.com', 'reject'),
+          ('alice@example.com', 'bob@example.com', 'save_later'))  # the last decision for a pair wins
+    batch(client, ('alice@example.com', 'bob@example.com', 'save_later'))
+
+    assert wings.UserPreference.query.count() == 1
+    assert preferences() == {('alice@example.com', 'bob@example.com'): 'save_later'}
+
+
+def test_batch_checks_each_round_once(client, database, make_users, monkeypatch):
+    bar, bar_man, bar_woman = start_location(database, make_users, 'bar')
+    pub, pub_man, pub_woman = start_location(database, make_users, 'pub')
+    checked = []
+    is_round_complete = wings.is_round_complete
+    monkeypatch.setattr(wings, 'is_round_complete', lambda location_id: checked.append(location_id)
+                        or is_round_complete(location_id))
+
+    result = batch(client, (bar_man, bar_woman, 'like'), (bar_woman, bar_man, 'like'),
+                   (pub_man, pub_woman, 'reject'), (bar_man, bar_woman, 'like'))
+
+    assert sorted(checked) == [bar, pub]
+    rounds = {r['location_id']: r for r in result['rounds']}
+    assert rounds[bar]['round_status'] == 'complete' and rounds[bar]['matchmaking_job']
+    assert rounds[pub] == {'location_id': pub, 'round_status': 'ongoing', 'next_round_started': False}
+    wings.db.session.expire_all()
+    pending = dict(database.session.query(wings.RoundProgress.location_id, wings.RoundProgress.pending_decisions))
+    assert pending == {bar: 0, pub: 1}
+
+    # Replaying the same swipes changes decisions but doesn't count them again
+    batch(client, (pub_man, pub_woman, 'like'))
+    batch(client, (pub_man, pub_woman, 'like'))
+    wings.db.session.expire_all()
+    assert wings.RoundProgress.query.filter_by(location_id=pub).one().pending_decisions == 1
@@ -0,0 +1,101 @@
+"""
+Query plans of the hot paths against the migrated schema.
+
+Sequential scans are disabled for these EXPLAINs, so the planner picks an index whenever one can
+serve the query. A Seq Scan left in the plan means no index matches it; the test doesn't depend
+on table sizes or statistics.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import and_, or_, select
+from sqlalchemy.dialects import postgresql
+
+import app as wings
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from plan_nodes(child)
+
+
+def explain(stmt):
+    """Plan nodes of stmt as (node type, table, index name) tuples"""
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+    with wings.db.engine.connect() as conn:
+        conn.exec_driver_sql('SET enable_seqscan = off')
+        plan = conn.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + sql).scalar()[0]['Plan']
+    return [(node['Node Type'], node.get('Relation Name'), node.get('Index Name')) for node in plan_nodes(plan)]
+
+
+M, P = wings.Match, wings.UserPreference
+
+HOT_PATHS = {
+    # Round lookups per location (is_round_complete, start_round, matches_at_location)
+    'matches of a round': (
+        select(M).where(M.location_id == 1, M.round_number == 2, M.status == 'active', M.matched_expired == False),
+        {'ix_matches_location_round_status'}
+    ),
+    # Match feeds: every match of a user
+    'matches of a user': (
+        select(M).where(or_(M.user1_id == 7, M.user2_id == 7)),
+        {'ix_matches_user1_id', 'ix_matches_user2_id'}
+    ),
+    # set_preference / consent rules
+    'preference of a pair': (
+        select(P).where(P.user_id == 7, P.preferred_user_id == 8),
+        {'unique_user_preference'}
+    ),
+    # Chat history page (get_chats)
+    'chat page': (
+        select(wings.Message).where(wings.Message.conversation_key == '7:8', wings.Message.id < 1000)
+        .order_by(wings.Message.id.desc()).limit(50),
+        {'ix_messages_conversation_key_id'}
+    ),
+    # Inbox, newest conversation first
+    'inbox': (
+        select(wings.Conversation).where(wings.Conversation.user_id == 7)
+        .order_by(wings.Conversation.last_message_at.desc(), wings.Conversation.id.desc()),
+        {'ix_conversations_user_last_message_at'}
+    ),
+    # Profile hydration (load_profiles) and /userData lookups
+    'profile of a user': (
+        select(wings.UserData).where(wings.UserData.user_auth_id == 7),
+        {'unique_userdata_user_auth_id'}
+    ),
+    'image of a user': (
+        select(wings.UserImages).where(wings.UserImages.user_auth_id == 7),
+        {'ix_userImage_user_auth_id'}
+    ),
+    'relationship data of a user': (
+        select(wings.RelationshipData).where(wings.RelationshipData.user_auth_id == 7),
+        {'ix_relationshipData_user_auth_id'}
+    ),
+    # Attendees and checked-in users of an event
+    'attendees of a location': (
+        select(wings.Attendance).where(wings.Attendance.location_id == 1),
+        {'ix_attendance_location_id'}
+    ),
+    'check-ins of a location': (
+        select(wings.CheckIn).where(wings.CheckIn.location_id == 1),
+        {'ix_checkins_location_id'}
+    ),
+    # Check-in deadlines the scheduler loads
+    'events starting soon': (
+        select(wings.LocationInfo).where(and_(
+            wings.LocationInfo.starts_at >= datetime(2026, 1, 1, tzinfo=timezone.utc),
+            wings.LocationInfo.starts_at <= datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(hours=1)
+        )),
+        {'ix_locationInfo_starts_at'}
+    ),
+}
+
+
+@pytest.mark.parametrize('name', HOT_PATHS)
+def test_hot_path_uses_index(database, name):
+    stmt, indexes = HOT_PATHS[name]
+    nodes = explain(stmt)
+
+    assert not [node for node in nodes if node[0] == 'Seq Scan'], nodes
+    assert {index for _, _, index in nodes if index} == indexes, nodes
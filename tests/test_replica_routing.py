@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event
+
+import app as wings
+
+
+@pytest.fixture
+def replica(database, monkeypatch):
+    """
+    A 'replica' bind: a second engine on the test database, so reads can be told apart by engine
+    """
+    url = wings.app.config['SQLALCHEMY_DATABASE_URI']
+    engine = create_engine(url)
+    monkeypatch.setitem(wings.app.config, 'SQLALCHEMY_BINDS', {'replica': {'url': url}})
+    monkeypatch.setitem(wings.db.engines, 'replica', engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def statements_by_engine(replica):
+    @contextmanager
+    def record():
+        statements = {'primary': [], 'replica': []}
+        listeners = []
+        for name, engine in (('primary', wings.db.engine), ('replica', replica)):
+            def before_cursor_execute(conn, cursor, statement, parameters, context, executemany, name=name):
+                statements[name].append(statement)
+            event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+            listeners.append((engine, before_cursor_execute))
+        try:
+            yield statements
+        finally:
+            for engine, listener in listeners:
+                event.remove(engine, 'before_cursor_execute', listener)
+    return record
+
+
+def get(client, url):
+    # Requests here share the fixture's app context; start each with a new session, as in production
+    wings.db.session.remove()
+    return client.get(url)
+
+
+@pytest.fixture
+def location_id(make_users, database):
+    make_users([{'gender': 'male'}, {'gender': 'female'}])
+    location = wings.LocationInfo(location='bar', maxAttendees=100, current_round=1)
+    database.session.add(location)
+    database.session.commit()
+    return location.id
+
+
+def test_read_only_endpoint_reads_from_replica(client, statements_by_engine, location_id):
+    with statements_by_engine() as statements:
+        response = get(client, '/locationInfo')
+
+    assert response.status_code == 200
+    assert statements['replica'] and not statements['primary']
+    assert wings.PRIMARY_UNTIL_COOKIE not in response.headers.get('Set-Cookie', '')
+
+
+def test_use_primary_keeps_reads_and_writes_on_primary(client, statements_by_engine, location_id):
+    with statements_by_engine() as statements:
+        response = get(client, f'/matches_at_location/1/{location_id}?create_new_matches=true')
+
+    assert response.status_code == 202
+    assert statements['primary'] and not statements['replica']
+    assert any(statement.startswith('INSERT INTO matchmaking_jobs') for statement in statements['primary'])
+
+
+def test_write_sets_cookie_and_next_reads_use_primary(client, statements_by_engine, location_id):
+    response = get(client, f'/matches_at_location/1/{location_id}?create_new_matches=true')
+    assert wings.PRIMARY_UNTIL_COOKIE in response.headers['Set-Cookie']
+
+    with statements_by_engine() as statements:
+        response = get(client, '/locationInfo')  # the client sends the cookie back
+    assert response.status_code == 200
+    assert statements['primary'] and not statements['replica']
+
+    client.delete_cookie(wings.PRIMARY_UNTIL_COOKIE)
+    with statements_by_engine() as statements:
+        get(client, '/locationInfo')
+    assert statements['replica'] and not statements['primary']
+
+
+def test_no_cookie_without_replica(client, location_id):
+    response = get(client, f'/matches_at_location/1/{location_id}?create_new_matches=true')
+
+    assert response.status_code == 202
+    assert wings.PRIMARY_UNTIL_COOKIE not in response.headers.get('Set-Cookie', '')
@@ -0,0 +1,92 @@
+import pytest
+
+import app as wings
+
+
+@pytest.fixture
+def running_round(database, make_users):
+    """A location whose round 1 has two active matches: (location_id, [(user1 email, user2 email), ...])"""
+    ids = make_users([{'gender': 'male', 'email': f'm{i}@example.com'} for i in range(2)] +
+                     [{'gender': 'female', 'email': f'f{i}@example.com'} for i in range(2)])
+    location = wings.LocationInfo(location='bar', maxAttendees=100, current_round=1)
+    database.session.add(location)
+    database.session.flush()
+    database.session.add_all([wings.CheckIn(user_id=uid, location_id=location.id) for uid in ids])
+    database.session.commit()
+    wings.advance_round(location.id)
+    database.session.commit()
+
+    emails = dict(database.session.query(wings.Task.id, wings.Task.email))
+    pairs = [(emails[m.user1_id], emails[m.user2_id])
+             for m in wings.Match.query.filter_by(location_id=location.id, round_number=1)]
+    assert len(pairs) == 2
+    return location.id, pairs
+
+
+def progress(location_id, round_number=1):
+    wings.db.session.expire_all()
+    row = wings.RoundProgress.query.filter_by(location_id=location_id, round_number=round_number).one()
+    return row.total_matches, row.pending_decisions
+
+
+def prefer(client, user_email, preferred_user_email, preference='like'):
+    response = client.post('/preference', json={'user_email': user_email, 'preferred_user_email': preferred_user_email,
+                                                'preference': preference})
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def test_round_starts_with_two_decisions_per_match(running_round):
+    location_id, _ = running_round
+    assert progress(location_id) == (2, 4)
+    assert not wings.is_round_complete(location_id)
+
+
+def test_each_first_decision_decrements_once(client, running_round):
+    location_id, [(a, b), (c, d)] = running_round
+
+    assert prefer(client, a, b)['round_status'] == 'ongoing'
+    assert progress(location_id) == (2, 3)
+    prefer(client, a, b, 'save_later')  # changing a decision isn't a new one
+    assert progress(location_id) == (2, 3)
+    prefer(client, b, a, 'reject')
+    prefer(client, c, d)
+    assert progress(location_id) == (2, 1)
+    assert not wings.is_round_complete(location_id)
+
+
+def test_round_completes_at_zero(client, running_round):
+    location_id, [(a, b), (c, d)] = running_round
+    for user, other in [(a, b), (b, a), (c, d)]:
+        prefer(client, user, other)
+
+    last = prefer(client, d, c)
+
+    assert progress(location_id) == (2, 0)
+    assert wings.is_round_complete(location_id)
+    assert last['round_status'] == 'complete' and last['matchmaking_job']
+
+
+def test_reconcile_rounds_repairs_corrupted_counter(client, running_round):
+    location_id, [(a, b), _] = running_round
+    prefer(client, a, b)
+    wings.RoundProgress.query.filter_by(location_id=location_id).update({'pending_decisions': 0})
+    wings.db.session.commit()
+    assert wings.is_round_complete(location_id)  # wrong: three decisions are still missing
+
+    result = wings.app.test_cli_runner().invoke(args=['reconcile-rounds'])
+
+    assert result.exit_code == 0, result.output
+    assert f'Location {location_id} round 1: 3 decisions pending over 2 matches' in result.output
+    assert progress(location_id) == (2, 3)
+    assert not wings.is_round_complete(location_id)
+
+
+def test_missing_counter_is_rebuilt(client, running_round):
+    location_id, [(a, b), _] = running_round
+    prefer(client, a, b)
+    wings.RoundProgress.query.filter_by(location_id=location_id).delete()
+    wings.db.session.commit()
+
+    assert not wings.is_round_complete(location_id)
+    assert progress(location_id) == (2, 3)
@@ -0,0 +1,30 @@
+import random
+from itertools import product
+
+import pytest
+
+import app as wings
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_round_robin_schedule_covers_every_new_pair_once(seed):
+    rng = random.Random(seed)
+    males = [f'm{i}' for i in range(rng.randint(0, 12))]
+    females = [f'f{j}' for j in range(rng.randint(0, 12))]
+    all_pairs = list(product(males, females))
+    previous_pairs = set(rng.sample(all_pairs, rng.randint(0, len(all_pairs))))
+
+    rounds = wings.round_robin_schedule(males, females, previous_pairs)
+
+    scheduled = [pair for pairs in rounds for pair in pairs]
+    assert sorted(scheduled) == sorted(set(all_pairs) - previous_pairs)  # every new pair, exactly once
+    assert len(rounds) <= max(len(males), len(females))
+    for pairs in rounds:
+        assert pairs  # empty rounds are dropped
+        assert len({m for m, _ in pairs}) == len({f for _, f in pairs}) == len(pairs)
+
+
+def test_full_rounds_without_previous_pairs():
+    rounds = wings.round_robin_schedule(['m1', 'm2', 'm3'], ['f1', 'f2', 'f3', 'f4', 'f5'])
+    assert len(rounds) == 5
+    assert all(len(pairs) == 3 for pairs in rounds)  # the smaller side is paired every round
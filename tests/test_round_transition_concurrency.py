@@ -0,0 +1,82 @@
+import pytest
+
+import app as wings
+
+THREADS = 8
+
+
+@pytest.fixture
+def running_round(database, make_users):
+    """A location with 4 + 4 checked-in users and its first round started: (location_id, pairs)"""
+    ids = make_users([{'gender': 'male', 'email': f'm{i}@example.com'} for i in range(4)] +
+                     [{'gender': 'female', 'email': f'f{i}@example.com'} for i in range(4)])
+    location = wings.LocationInfo(location='bar', maxAttendees=100, current_round=1)
+    database.session.add(location)
+    database.session.flush()
+    database.session.add_all([wings.CheckIn(user_id=uid, location_id=location.id) for uid in ids])
+    database.session.commit()
+
+    wings.advance_round(location.id)
+    database.session.commit()
+    pairs = [(m.user1_id, m.user2_id) for m in wings.Match.query.filter_by(location_id=location.id, round_number=1)]
+    assert len(pairs) == 4
+    return location.id, pairs
+
+
+def round_summary(location_id):
+    wings.db.session.remove()
+    location = wings.db.session.get(wings.LocationInfo, location_id)
+    counts = {}
+    for match in wings.Match.query.filter_by(location_id=location_id):
+        counts[match.round_number, match.status] = counts.get((match.round_number, match.status), 0) + 1
+    return location.current_round, counts
+
+
+def test_concurrent_final_swipes_queue_one_job(running_round, run_in_threads):
+    location_id, pairs = running_round
+    emails = {uid: email for uid, email in wings.db.session.query(wings.Task.id, wings.Task.email)}
+    swipes = [(emails[a], emails[b]) for a, b in pairs] + [(emails[b], emails[a]) for a, b in pairs]
+
+    def swipe(user_email, preferred_user_email):
+        response = wings.app.test_client().post('/preference', json={
+            'user_email': user_email, 'preferred_user_email': preferred_user_email, 'preference': 'like'
+        })
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()
+
+    results = run_in_threads(swipe, swipes)
+
+    job_ids = {result.get('matchmaking_job') for result in results} - {None}
+    assert len(job_ids) == 1
+    assert wings.MatchmakingJob.query.filter_by(location_id=location_id).count() == 1
+    progress = wings.RoundProgress.query.filter_by(location_id=location_id, round_number=1).one()
+    assert progress.pending_decisions == 0
+
+
+@pytest.mark.parametrize('repeat', range(3))
+def test_concurrent_round_transitions_start_one_round(running_round, run_in_threads, repeat):
+    location_id, pairs = running_round
+    for a, b in pairs:
+        wings.db.session.add_all([
+            wings.UserPreference(user_id=a, preferred_user_id=b, preference='like'),
+            wings.UserPreference(user_id=b, preferred_user_id=a, preference='like'),
+        ])
+    wings.reconcile_round_progress(location_id, 1)
+    wings.db.session.commit()
+    assert wings.is_round_complete(location_id)
+
+    def transition():
+        # What each matchmaking worker does with a job for the location
+        with wings.app.app_context():
+            summary = wings.advance_round(location_id)
+            wings.db.session.commit()
+            return summary
+
+    summaries = run_in_threads(transition, [()] * THREADS)
+
+    # One worker ended round 1 and created round 2; the others found it running
+    assert sum(summary['round_completed'] for summary in summaries) == 1
+    assert sum(summary['matches_created'] for summary in summaries) == 4
+    current_round, counts = round_summary(location_id)
+    assert current_round == 2
+    assert counts == {(1, 'expired'): 4, (2, 'active'): 4}
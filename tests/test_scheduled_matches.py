@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app as wings
+
+
+@pytest.fixture
+def pair(database, make_users):
+    """Alice and Bob with an expired match from round 1 and a precomputed round 3 match: (expired id, scheduled id)"""
+    alice, bob = make_users([{'gender': 'female', 'email': 'alice@example.com'},
+                             {'gender': 'male', 'email': 'bob@example.com'}])
+    now = datetime.now(timezone.utc)
+    expired = wings.Match(user1_id=bob, user2_id=alice, status='expired', consent='pending', matched_expired=True,
+                          round_number=1, match_date=now - timedelta(hours=1))
+    scheduled = wings.Match(user1_id=bob, user2_id=alice, status='scheduled', consent='pending',
+                            matched_expired=False, round_number=3, match_date=now + timedelta(hours=1))
+    database.session.add_all([expired, scheduled])
+    database.session.commit()
+    return expired.id, scheduled.id
+
+
+def consents(*match_ids):
+    wings.db.session.expire_all()
+    return [wings.db.session.get(wings.Match, match_id).consent for match_id in match_ids]
+
+
+def prefer(client, user_email, preferred_user_email, preference):
+    response = client.post('/preference', json={'user_email': user_email, 'preferred_user_email': preferred_user_email,
+                                                'preference': preference})
+    assert response.status_code == 200, response.json
+
+
+def test_like_updates_expired_match_not_scheduled_one(client, pair):
+    prefer(client, 'alice@example.com', 'bob@example.com', 'like')
+    prefer(client, 'bob@example.com', 'alice@example.com', 'like')
+
+    assert consents(*pair) == ['active', 'pending']
+
+
+def test_reject_deletes_expired_match_not_scheduled_one(client, pair):
+    prefer(client, 'alice@example.com', 'bob@example.com', 'reject')
+
+    assert consents(*pair) == ['deleted', 'pending']
+
+
+def test_batch_reject_skips_scheduled_match(client, pair):
+    response = client.post('/preferences/batch', json={'preferences': [
+        {'user_email': 'alice@example.com', 'preferred_user_email': 'bob@example.com', 'preference': 'reject'}
+    ]})
+    assert response.status_code == 200, response.json
+
+    assert consents(*pair) == ['deleted', 'pending']
+
+
+def test_scheduled_matches_dont_exclude_pairs(database, make_users):
+    carol, dave = make_users([{'gender': 'female', 'hobbies': ['music']}, {'gender': 'male', 'hobbies': ['music']}])
+    database.session.add(wings.Match(user1_id=dave, user2_id=carol, status='scheduled', round_number=2))
+    database.session.commit()
+
+    matches = wings.match_all_users()
+
+    assert matches[carol]['match_id'] == dave and matches[dave]['match_id'] == carol
@@ -0,0 +1,111 @@
+"""
+Socket.IO emits across workers. Each worker is a separate Socket.IO server with its own HTTP
+server, and the workers only share the message queue; real Socket.IO clients connect to them.
+local:// always runs; set TEST_SOCKETIO_MESSAGE_QUEUE (e.g. redis://localhost:6379/1) to run the
+same tests against a real queue.
+"""
+import os
+import threading
+import time
+import uuid
+
+import pytest
+import socketio
+from flask import Flask
+from flask_socketio import join_room
+from werkzeug.serving import make_server
+
+import app as wings
+
+QUEUES = ['local://'] + [url for url in [os.environ.get('TEST_SOCKETIO_MESSAGE_QUEUE')] if url]
+
+
+class Worker:
+    def __init__(self, url, channel):
+        self.app = Flask(f'worker-{uuid.uuid4().hex[:8]}')
+        self.socketio = wings.make_socketio(self.app, url, channel)
+
+        @self.socketio.on('join')
+        def on_join(data):
+            join_room(data['user_email'])
+            return True
+
+        self.http = make_server('127.0.0.1', 0, self.app, threaded=True)
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+        self.clients = []
+
+    def connect(self, email):
+        """A client connected to this worker, in the email's room. Its .received lists (event, data)"""
+        client = socketio.Client()
+        client.received = []
+        client.on('*', lambda event, data: client.received.append((event, data)))
+        client.connect(f'http://127.0.0.1:{self.http.port}', transports=['polling'])
+        assert client.call('join', {'user_email': email}, timeout=5)
+        self.clients.append(client)
+        return client
+
+    def close(self):
+        for client in self.clients:
+            client.disconnect()
+        self.http.shutdown()
+
+
+def wait_for(client, event, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        received = [data for name, data in client.received if name == event]
+        if received:
+            return received
+        time.sleep(0.01)
+    return [data for name, data in client.received if name == event]
+
+
+@pytest.fixture
+def make_worker():
+    workers = []
+
+    def make(url, channel):
+        workers.append(Worker(url, channel))
+        return workers[-1]
+    yield make
+    for worker in workers:
+        worker.close()
+
+
+@pytest.fixture(params=QUEUES)
+def workers(request, make_worker):
+    channel = f'test-{uuid.uuid4().hex}'
+    return make_worker(request.param, channel), make_worker(request.param, channel)
+
+
+def test_emit_reaches_room_on_other_worker(workers):
+    worker1, worker2 = workers
+    alice = worker2.connect('alice@example.com')
+    bob = worker1.connect('bob@example.com')
+
+    worker1.socketio.emit('new_match', {'match_id': 1}, room='alice@example.com')
+
+    assert wait_for(alice, 'new_match') == [{'match_id': 1}]
+    assert wait_for(bob, 'new_match', timeout=0.3) == []
+
+
+def test_emit_reaches_every_worker_once(workers):
+    worker1, worker2 = workers
+    clients = [worker1.connect('carol@example.com'), worker2.connect('carol@example.com')]
+
+    worker2.socketio.emit('round_ready', {'job_id': 7}, room='carol@example.com')
+
+    for client in clients:
+        assert wait_for(client, 'round_ready') == [{'job_id': 7}]
+    time.sleep(0.3)
+    assert [wait_for(client, 'round_ready', timeout=0) for client in clients] == [[{'job_id': 7}]] * 2
+
+
+def test_separate_channels_dont_share_emits(make_worker):
+    worker1 = make_worker('local://', f'test-{uuid.uuid4().hex}')
+    worker2 = make_worker('local://', f'test-{uuid.uuid4().hex}')
+    dave = worker2.connect('dave@example.com')
+
+    worker1.socketio.emit('new_match', {'match_id': 2}, room='dave@example.com')
+
+    assert wait_for(dave, 'new_match', timeout=0.3) == []
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+import app as wings
+
+
+@pytest.fixture
+def profiles(make_users, monkeypatch):
+    monkeypatch.setattr(wings, 'STREAM_BATCH_SIZE', 3)  # several partitions
+    monkeypatch.setattr(wings, 'get_unix_timestamp', lambda dt: 1_700_000_000)  # current_server_time of each user
+    ids = make_users([{'gender': 'female', 'hobbies': ['music']}, {'gender': 'male', 'age': '41'}] * 4)
+    wings.db.session.add(wings.UserImages(user_auth_id=ids[1], imageString='1.jpg'))
+    wings.db.session.commit()
+    return ids
+
+
+def test_streamed_json_matches_buffered(client, profiles):
+    buffered = client.get('/userData').json
+    streamed = client.get('/userData?stream=json')
+    assert streamed.mimetype == 'application/json'
+    assert json.loads(streamed.get_data(as_text=True)) == buffered
+    assert len(buffered['users']) == 8
+
+
+def test_streamed_ndjson_and_export(client, profiles):
+    buffered = client.get('/userData').json['users']
+    ndjson = client.get('/userData?stream=ndjson')
+    assert ndjson.mimetype == 'application/x-ndjson'
+    assert [json.loads(line) for line in ndjson.get_data(as_text=True).splitlines()] == buffered
+
+    export = client.get('/export/users?fields=id,email')
+    assert export.headers['Content-Disposition'] == 'attachment; filename=users.ndjson'
+    assert [json.loads(line) for line in export.get_data(as_text=True).splitlines()] == \
+        [{'id': user['id'], 'email': user['email']} for user in buffered]
+
+
+def test_unknown_stream_format(client, database):
+    assert client.get('/userData?stream=xml').status_code == 400
+    assert client.get('/export/users?format=xml').status_code == 400
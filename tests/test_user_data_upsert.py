@@ -0,0 +1,119 @@
+import app as wings
+
+
+def profile(email, **fields):
+    data = {'email': email, 'firstname': 'First', 'lastname': 'Last', 'gender': 'female', 'hobbies': ['music'],
+            'preferences': [], 'phone_number': '0', 'age': '30', 'bio': ''}
+    data.update(fields)
+    return data
+
+
+def make_accounts(emails):
+    accounts = [wings.Task(email=email, password='secret') for email in emails]
+    wings.db.session.add_all(accounts)
+    wings.db.session.commit()
+    return [account.id for account in accounts]
+
+
+def profiles():
+    wings.db.session.expire_all()
+    return {data.email: data for data in wings.UserData.query}
+
+
+def mass_update(client, users):
+    response = client.post('/massUserData', json={'users': users})
+    assert response.status_code == 201, response.json
+    return response.json
+
+
+def test_upsert_reports_created_and_updated(database):
+    alice, bob = make_accounts(['alice@example.com', 'bob@example.com'])
+    assert wings.upsert_user_data([wings.user_data_row(alice, profile('alice@example.com'))]) == {alice: True}
+
+    written = wings.upsert_user_data([wings.user_data_row(alice, profile('alice@example.com', bio='updated')),
+                                      wings.user_data_row(bob, profile('bob@example.com'))])
+    database.session.commit()
+
+    assert written == {alice: False, bob: True}
+    assert profiles()['alice@example.com'].bio == 'updated'
+    assert wings.UserData.query.count() == 2
+
+
+def test_upsert_of_nothing_runs_no_query(database, count_queries):
+    with count_queries() as statements:
+        assert wings.upsert_user_data([]) == {}
+    assert statements == []
+
+
+def test_mass_update_reports_every_row(client):
+    make_accounts(['alice@example.com', 'bob@example.com'])
+    mass_update(client, [profile('alice@example.com')])
+
+    body = mass_update(client, [profile('alice@example.com', bio='again'), profile('ghost@example.com'),
+                                profile('bob@example.com')])
+
+    assert [(r['index'], r['email'], r['status']) for r in body['results']] == [
+        (0, 'alice@example.com', 'updated'), (1, 'ghost@example.com', 'user_not_found'),
+        (2, 'bob@example.com', 'created')]
+    assert body['counts'] == {'created': 1, 'updated': 1, 'duplicate': 0, 'user_not_found': 1}
+    assert set(profiles()) == {'alice@example.com', 'bob@example.com'}
+
+
+def test_last_entry_for_an_email_wins(client):
+    make_accounts(['alice@example.com'])
+
+    body = mass_update(client, [profile('alice@example.com', bio='first'),
+                                profile('alice@example.com', bio='second'),
+                                profile('alice@example.com', bio='third')])
+
+    assert [r['status'] for r in body['results']] == ['duplicate', 'duplicate', 'created']
+    assert profiles()['alice@example.com'].bio == 'third'
+    assert wings.UserData.query.count() == 1
+
+
+def test_mass_update_in_chunks(client, monkeypatch, count_queries):
+    monkeypatch.setattr(wings, 'USER_DATA_CHUNK', 2)
+    emails = [f'u{i}@example.com' for i in range(4)]
+    make_accounts(emails)
+    users = [profile(email, bio=f'entry {i}') for i, email in enumerate(emails)]
+    users.append(profile('u0@example.com', bio='entry 4'))  # repeats u0 in the last chunk
+
+    with count_queries() as statements:
+        body = mass_update(client, users)
+
+    upserts = [s for s in statements if s.startswith('INSERT INTO userdata')]
+    assert len(upserts) == 3  # 5 entries in chunks of 2
+    assert [r['status'] for r in body['results']] == ['created', 'created', 'created', 'created', 'updated']
+    assert {email: data.bio for email, data in profiles().items()} == {
+        'u0@example.com': 'entry 4', 'u1@example.com': 'entry 1', 'u2@example.com': 'entry 2',
+        'u3@example.com': 'entry 3'}
+
+
+def test_mass_update_missing_field_fails_whole_request(client):
+    make_accounts(['alice@example.com', 'bob@example.com'])
+    incomplete = profile('bob@example.com')
+    del incomplete['bio']
+
+    response = client.post('/massUserData', json={'users': [profile('alice@example.com'), incomplete]})
+
+    assert response.status_code == 500
+    assert profiles() == {}
+
+
+def test_post_user_data_created_then_updated(client):
+    make_accounts(['alice@example.com'])
+
+    first = client.post('/userData', json=profile('alice@example.com'))
+    second = client.post('/userData', json=profile('alice@example.com', firstname='Alicia'))
+
+    assert (first.status_code, first.json) == (201, {'message': 'Added user details'})
+    assert (second.status_code, second.json) == (201, {'message': 'Updated user details'})
+    assert profiles()['alice@example.com'].firstname == 'Alicia'
+    assert wings.UserData.query.count() == 1
+
+
+def test_post_user_data_unknown_email(client):
+    response = client.post('/userData', json=profile('ghost@example.com'))
+
+    assert response.status_code == 400
+    assert profiles() == {}